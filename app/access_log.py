@@ -0,0 +1,181 @@
+"""Structured access logging of redirects off the request path.
+
+This module provides a bounded in-memory buffer of access records, a
+background thread writing them as JSON lines in batches, and the ASGI
+middleware recording redirects. The request path only samples and appends a
+tuple to the buffer; formatting and I/O happen in the writer thread. Records
+are dropped and counted rather than blocking when the buffer is full.
+"""
+
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, TextIO
+from urllib.parse import urlsplit
+
+from app.config import settings
+
+# Single-segment GET paths that are not short links
+NON_LINK_PATHS = {"/", "/changes", "/docs", "/metrics", "/openapi.json", "/redoc"}
+
+
+class AccessLogger:
+    """Buffered JSON lines access logger with a background writer thread.
+
+    Attributes:
+        sample_rate: Fraction of requests recorded, from 0 to 1.
+        enqueued: Number of records accepted into the buffer.
+        dropped: Number of records dropped because the buffer was full.
+        written: Number of records written out.
+    """
+
+    def __init__(
+        self, path: str, buffer_size: int, sample_rate: float, flush_interval: float
+    ) -> None:
+        self.path = path
+        self.buffer_size = buffer_size
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        # deque appends and pops are atomic, no lock needed on the request path
+        self._buffer: deque = deque()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(
+        self, link: str, status: int, location: Optional[bytes], latency: float
+    ) -> None:
+        """Sample and enqueue an access record without blocking."""
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        if len(self._buffer) >= self.buffer_size:
+            self.dropped += 1
+            return
+        self._buffer.append((time.time(), link, status, location, latency))
+        self.enqueued += 1
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="access-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer thread after writing the buffered records."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        """Write buffered records every flush interval until stopped."""
+        output = open(self.path, "a") if self.path else sys.stdout
+        try:
+            while not self._stop.wait(self.flush_interval):
+                self.flush(output)
+            self.flush(output)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+    def flush(self, output: TextIO) -> int:
+        """Format and write every buffered record in one batch.
+
+        Args:
+            output: Stream the JSON lines are written to.
+
+        Returns:
+            int: Number of records written.
+        """
+        lines = []
+        while self._buffer:
+            timestamp, link, status, location, latency = self._buffer.popleft()
+            lines.append(
+                json.dumps(
+                    {
+                        "ts": round(timestamp, 3),
+                        "code": link,
+                        "host": (
+                            urlsplit(location.decode()).hostname if location else None
+                        ),
+                        "status": status,
+                        "latency_ms": round(latency * 1000, 3),
+                    }
+                )
+            )
+        if lines:
+            output.write("\n".join(lines) + "\n")
+            output.flush()
+            self.written += len(lines)
+        return len(lines)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the logger counters for the metrics endpoint."""
+        return {
+            "buffered": len(self._buffer),
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+        }
+
+
+access_logger = AccessLogger(
+    path=settings.access_log_path,
+    buffer_size=settings.access_log_buffer_size,
+    sample_rate=settings.access_log_sample_rate,
+    flush_interval=settings.access_log_flush_interval_ms / 1000,
+)
+
+
+class AccessLogMiddleware:
+    """ASGI middleware recording short link redirects.
+
+    Args:
+        app: The wrapped ASGI application.
+        logger: Logger the access records are enqueued into.
+    """
+
+    def __init__(self, app, logger: AccessLogger) -> None:
+        self.app = app
+        self.logger = logger
+
+    async def __call__(self, scope, receive, send) -> None:
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or not settings.access_log_enabled
+            or scope["method"] != "GET"
+            or path in NON_LINK_PATHS
+            or path.count("/") != 1
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        response = {}
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name == b"location":
+                        response["location"] = value
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.logger.record(
+                path[1:],
+                response.get("status", 500),
+                response.get("location"),
+                time.perf_counter() - start,
+            )
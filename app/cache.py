@@ -0,0 +1,178 @@
+"""In-process cache of short link targets with warm-start snapshots.
+
+This module provides a bounded LRU cache used by the redirect and bulk resolve
+paths, along with helpers to persist the hottest cached short links on shutdown
+and to reload them in bulk on startup.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.config import settings
+
+
+class LinkCache:
+    """Bounded LRU cache mapping short link identifiers to target URLs.
+
+    Tracks a hit count per cached link so the hottest links can be written to
+    a snapshot. Entries expire after ``ttl`` seconds, which bounds how long a
+    link deleted by another process keeps being served. Safe to use from the
+    threadpool running the sync endpoints.
+
+    Invalidations bump a generation counter. Callers read ``generation()``
+    before looking a link up in the database and pass it to ``put``, which
+    drops the entry if an invalidation happened in between, so a read racing
+    with a delete cannot re-insert the deleted link.
+
+    Attributes:
+        max_size: Maximum number of cached links (0 disables the cache).
+        ttl: Lifetime of an entry in seconds (0 disables expiry).
+        hits: Number of lookups served from the cache.
+        misses: Number of lookups not found in the cache.
+    """
+
+    def __init__(self, max_size: int, ttl: float = 0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, List]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, link: str) -> Optional[str]:
+        """Return the cached target of a link, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(link)
+            if entry is not None and self.ttl and entry[2] <= time.monotonic():
+                del self._entries[link]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(link)
+            entry[1] += 1
+            self.hits += 1
+            return entry[0]
+
+    def generation(self) -> int:
+        """Return the invalidation generation to pass to ``put``."""
+        return self._generation
+
+    def put(self, link: str, target: str, generation: Optional[int] = None) -> None:
+        """Cache the target of a link, evicting the least recently used.
+
+        Args:
+            link: The short link identifier.
+            target: The target URL read from the database.
+            generation: Value of ``generation()`` taken before the database
+                read; the entry is dropped if the cache was invalidated since.
+        """
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            entry = self._entries.get(link)
+            if entry is not None:
+                entry[0] = target
+                entry[2] = expires_at
+                self._entries.move_to_end(link)
+                return
+            self._entries[link] = [target, 0, expires_at]
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, link: str) -> None:
+        """Remove a link from the cache."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(link, None)
+
+    def clear(self) -> None:
+        """Remove every link from the cache and reset the counters."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def hottest(self, count: int) -> List[str]:
+        """Return up to ``count`` cached links, most hit first."""
+        with self._lock:
+            entries = [(link, entry[1]) for link, entry in self._entries.items()]
+        entries.sort(key=lambda item: item[1], reverse=True)
+        return [link for link, _ in entries[:count]]
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and hit/miss counters."""
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+link_cache = LinkCache(settings.cache_size, settings.cache_ttl)
+
+
+def save_snapshot(cache: LinkCache, path: str, size: int) -> int:
+    """Write the hottest cached links to a snapshot file.
+
+    Only the short link identifiers are stored, ordered by hit count. Targets
+    are re-read from the database on load, so links deleted in the meantime
+    are not resurrected. The file is replaced atomically.
+
+    Args:
+        cache: Cache to take the hottest links from.
+        path: Snapshot file path.
+        size: Maximum number of links to write.
+
+    Returns:
+        int: Number of links written.
+    """
+    links = cache.hottest(size)
+    snapshot_path = Path(path)
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.tmp")
+    tmp_path.write_text(json.dumps({"created_at": time.time(), "links": links}))
+    os.replace(tmp_path, snapshot_path)
+    return len(links)
+
+
+def load_snapshot(cache: LinkCache, db: Session, path: str, max_age: int) -> int:
+    """Warm a cache from a snapshot file with a bulk database lookup.
+
+    Missing, unreadable or stale snapshots are ignored.
+
+    Args:
+        cache: Cache to fill.
+        db: Database session used to fetch the targets.
+        path: Snapshot file path.
+        max_age: Maximum snapshot age in seconds (0 disables the check).
+
+    Returns:
+        int: Number of links loaded into the cache.
+    """
+    try:
+        snapshot = json.loads(Path(path).read_text())
+        created_at = float(snapshot["created_at"])
+        links = [str(link) for link in snapshot["links"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return 0
+
+    if max_age and time.time() - created_at > max_age:
+        return 0
+
+    generation = cache.generation()
+    found = crud.get_links(db, links)
+    # Insert coldest first so the hottest links are the last to be evicted
+    for link in reversed(links):
+        if link in found:
+            cache.put(link, found[link][0], generation)
+    return len(found)
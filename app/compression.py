@@ -0,0 +1,254 @@
+"""Transparent compression of link targets and extras.
+
+This module provides SQLAlchemy column types that compress values on write and
+decompress them on read, along with the preset dictionary support used to get
+useful ratios on short strings such as URLs. Compression is deterministic for
+a given dictionary, so equality lookups on compressed columns keep working.
+
+New values use the configured dictionary. Every ``.dict`` file of the
+dictionary directory stays known, so values compressed with a previous
+dictionary remain readable after switching to a new one.
+
+Usage:
+    python -m app.compression build-dictionary --output /data/urls-v2.dict
+"""
+
+import argparse
+import json
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+from sqlalchemy import Text
+from sqlalchemy.types import TypeDecorator
+
+from app.config import settings
+
+# Marker byte of compressed values, followed by the 4-byte dictionary id
+MAGIC = b"Z"
+
+# Fixed so the same input always compresses to the same bytes
+COMPRESSION_LEVEL = 9
+
+# Suffix of the dictionary files loaded from the dictionary directory
+DICTIONARY_SUFFIX = ".dict"
+
+# Common URL and tracking fragments, most frequent last as zlib prefers
+DEFAULT_DICTIONARY = (
+    b'{"source": "{"campaign": "{"version": true}false}null'
+    b"utm_id=utm_content=utm_term=fbclid=gclid=msclkid=mc_eid=mc_cid="
+    b".html.php.aspx/index/blog/article/product/category/search?q="
+    b".org/.net/.io/.co.uk/.fr/.de/"
+    b"%20%2F%3A%3D%26"
+    b"&utm_campaign=&utm_medium=email&utm_medium=social&utm_medium=cpc"
+    b"&utm_source=newsletter&utm_source=google&utm_source=facebook"
+    b"?utm_source=&utm_medium=&utm_campaign="
+    b"http://www.https://www..com/https://"
+)
+
+
+def dictionary_id(dictionary: bytes) -> bytes:
+    """Return the 4-byte identifier stored in front of compressed values."""
+    return zlib.crc32(dictionary).to_bytes(4, "big")
+
+
+@lru_cache(maxsize=None)
+def _read_dictionary(path: str) -> bytes:
+    """Return the dictionary stored at ``path``, or the default one."""
+    return Path(path).read_bytes() if path else DEFAULT_DICTIONARY
+
+
+def dictionary_directory() -> str:
+    """Return the directory of known dictionaries, empty if there is none.
+
+    Defaults to the directory of the configured dictionary, so previous
+    dictionaries only need to be kept next to it.
+    """
+    if settings.compression_dictionary_dir:
+        return settings.compression_dictionary_dir
+    if settings.compression_dictionary_path:
+        return str(Path(settings.compression_dictionary_path).parent)
+    return ""
+
+
+@lru_cache(maxsize=None)
+def _dictionaries(path: str, directory: str) -> Dict[bytes, bytes]:
+    """Return the known dictionaries by id, the configured one included."""
+    dictionaries = {dictionary_id(DEFAULT_DICTIONARY): DEFAULT_DICTIONARY}
+    if directory:
+        for dictionary_path in sorted(Path(directory).glob(f"*{DICTIONARY_SUFFIX}")):
+            dictionary = dictionary_path.read_bytes()
+            dictionaries[dictionary_id(dictionary)] = dictionary
+    dictionary = _read_dictionary(path)
+    dictionaries[dictionary_id(dictionary)] = dictionary
+    return dictionaries
+
+
+def _find_dictionary(identifier: bytes) -> Optional[bytes]:
+    """Return the known dictionary with the given id, or None."""
+    path = settings.compression_dictionary_path
+    directory = dictionary_directory()
+    dictionary = _dictionaries(path, directory).get(identifier)
+    if dictionary is None and directory:
+        # Another process may have started using a dictionary added since
+        _dictionaries.cache_clear()
+        dictionary = _dictionaries(path, directory).get(identifier)
+    return dictionary
+
+
+def compress(value: str) -> Union[str, bytes]:
+    """Compress a string when it makes it smaller.
+
+    Args:
+        value: The string to compress.
+
+    Returns:
+        Union[str, bytes]: The compressed bytes, or the string unchanged when
+            compression is disabled or would not save space.
+    """
+    if not settings.compression_enabled:
+        return value
+    raw = value.encode()
+    dictionary = _read_dictionary(settings.compression_dictionary_path)
+    compressor = zlib.compressobj(
+        COMPRESSION_LEVEL, zlib.DEFLATED, -15, zdict=dictionary
+    )
+    compressed = (
+        MAGIC
+        + dictionary_id(dictionary)
+        + compressor.compress(raw)
+        + compressor.flush()
+    )
+    return compressed if len(compressed) < len(raw) else value
+
+
+def decompress(value: Union[str, bytes]) -> str:
+    """Decompress a value written by ``compress``.
+
+    Args:
+        value: A plain string or compressed bytes.
+
+    Returns:
+        str: The original string.
+
+    Raises:
+        ValueError: If the value was compressed with an unknown dictionary.
+    """
+    if isinstance(value, str):
+        return value
+    value = bytes(value)
+    if not value.startswith(MAGIC):
+        return value.decode()
+    dictionary = _find_dictionary(value[1:5])
+    if dictionary is None:
+        raise ValueError("Value compressed with an unknown dictionary")
+    decompressor = zlib.decompressobj(-15, zdict=dictionary)
+    return (decompressor.decompress(value[5:]) + decompressor.flush()).decode()
+
+
+class CompressedText(TypeDecorator):
+    """Text column compressed with the preset dictionary when enabled.
+
+    Plain and compressed values can coexist in the same column, so enabling or
+    disabling compression does not require migrating existing rows.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Any:
+        return None if value is None else compress(value)
+
+    def process_result_value(self, value: Any, dialect) -> Optional[str]:
+        return None if value is None else decompress(value)
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON column serialized to text and compressed when enabled."""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Any:
+        return None if value is None else compress(json.dumps(value))
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        return None if value is None else json.loads(decompress(value))
+
+
+def build_dictionary(samples: Iterable[str], size: int = 4096) -> bytes:
+    """Build a preset dictionary from a corpus of URLs or JSON documents.
+
+    Splits the samples into URL and JSON tokens, keeps the ones whose
+    occurrences save the most bytes, and orders them least frequent first
+    since zlib favors matches near the end of the dictionary.
+
+    Args:
+        samples: Strings representative of the stored values.
+        size: Maximum dictionary size in bytes.
+
+    Returns:
+        bytes: The dictionary.
+    """
+    counts: Counter = Counter()
+    for sample in samples:
+        counts.update(re.findall(r"[?&/.]?[^?&/.=]*=?", sample))
+
+    tokens = []
+    total = 0
+    for token, count in sorted(
+        counts.items(), key=lambda item: len(item[0]) * item[1], reverse=True
+    ):
+        encoded = token.encode()
+        if count < 2 or len(encoded) < 3 or total + len(encoded) > size:
+            continue
+        tokens.append((count, encoded))
+        total += len(encoded)
+
+    tokens.sort(key=lambda item: item[0])
+    return b"".join(token for _, token in tokens)
+
+
+def main() -> None:
+    """Parse command line arguments and build a dictionary from stored links."""
+    parser = argparse.ArgumentParser(description="ShortGic compression tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser(
+        "build-dictionary", help="Build a dictionary from the stored targets"
+    )
+    build.add_argument(
+        "--output",
+        required=True,
+        help=f"New {DICTIONARY_SUFFIX} file to write, next to the previous ones",
+    )
+    build.add_argument("--size", type=int, default=4096, help="Size in bytes")
+    build.add_argument(
+        "--limit", type=int, default=100000, help="Number of targets to sample"
+    )
+    args = parser.parse_args()
+    if Path(args.output).exists():
+        # Values compressed with the existing dictionary still need it
+        parser.error(f"{args.output} exists, write the new dictionary to a new file")
+
+    from sqlalchemy import select
+
+    from app import models
+    from app.database import ShardSessionLocal
+
+    samples = []
+    for session_factory in ShardSessionLocal:
+        with session_factory() as db:
+            samples.extend(
+                db.execute(select(models.Link.target).limit(args.limit)).scalars()
+            )
+
+    dictionary = build_dictionary(samples, args.size)
+    Path(args.output).write_bytes(dictionary)
+    print(f"Wrote {len(dictionary)} bytes dictionary from {len(samples)} targets")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,14 +18,66 @@ class Settings(BaseSettings):
 
     Attributes:
         database_path: Path to the SQLite database file.
+        shard_count: Number of SQLite files links are spread across (1 disables
+            sharding).
+        database_journal_mode: SQLite journal mode set on every connection
+            (empty keeps the SQLite default).
         app_name: Application name for branding and logging.
         debug: Enable debug mode for development.
         link_length: Length of generated short link identifiers.
         max_url_length: Maximum allowed length for target URLs.
+        resolve_max_links: Maximum number of links accepted by a bulk resolve.
+        resolve_chunk_size: Number of links looked up per ``IN`` query.
+        cache_size: Maximum number of cached link targets (0 disables the cache).
+        cache_ttl: Seconds a cached target is served before being re-read, which
+            bounds staleness across processes (0 disables expiry).
+        cache_snapshot_path: File the hottest cached links are written to on
+            shutdown and loaded from on startup (empty disables snapshots).
+        cache_snapshot_size: Maximum number of links written to the snapshot.
+        cache_snapshot_max_age: Age in seconds after which a snapshot is ignored
+            (0 disables the check).
+        compression_enabled: Compress link targets and extras on write.
+        compression_dictionary_path: Preset dictionary file used to compress new
+            values (empty uses the built-in URL dictionary).
+        compression_dictionary_dir: Directory whose ``.dict`` files are kept
+            readable after switching dictionaries (empty uses the directory of
+            ``compression_dictionary_path``).
+        load_shedding_enabled: Reject writes with 503 when reads slow down.
+        write_concurrency_min: Lower bound of the adaptive write limit.
+        write_concurrency_max: Upper bound of the adaptive write limit.
+        read_latency_target_ms: Read latency above which writes are throttled.
+        max_queue_depth: In-flight requests above which writes are rejected.
+        retry_after: Retry-After value in seconds sent with shed writes.
+        maintenance_enabled: Run the background database maintenance jobs.
+        maintenance_checkpoint_interval: Seconds between WAL checkpoints.
+        maintenance_truncate_every: Make every Nth checkpoint a TRUNCATE one.
+        maintenance_optimize_interval: Seconds between ``PRAGMA optimize`` runs.
+        maintenance_vacuum_interval: Seconds between incremental vacuum runs.
+        maintenance_vacuum_pages: Pages freed per incremental vacuum batch.
+        maintenance_vacuum_pause_ms: Pause between incremental vacuum batches.
+        maintenance_compact_interval: Seconds between changelog compactions.
+        changelog_retention: Age in seconds after which changes are compacted.
+        changelog_max_rows: Number of changes kept per database at most.
+        changes_page_size: Maximum number of changes returned per request.
+        changes_max_wait: Maximum long-poll duration in seconds.
+        changes_poll_interval_ms: Delay between changelog polls while waiting.
+        access_log_enabled: Write a JSON access log line per redirect.
+        access_log_path: File the access log is appended to (empty for stdout).
+        access_log_sample_rate: Fraction of redirects logged, from 0 to 1.
+        access_log_buffer_size: Records buffered before new ones are dropped.
+        access_log_flush_interval_ms: Delay between access log batch writes.
+        scanner_concurrency: Maximum concurrent requests of the target scanner.
+        scanner_per_host_concurrency: Maximum concurrent requests per host.
+        scanner_per_host_interval_ms: Minimum delay between requests to a host.
+        scanner_timeout: Timeout in seconds of each scanner request.
+        scanner_max_redirects: Redirects followed before reporting a loop.
+        scanner_chunk_size: Links read from the database per query.
     """
 
     # Database configuration
     database_path: str = "./shortgic.db"
+    shard_count: int = 1
+    database_journal_mode: str = "wal"
 
     # Application configuration
     app_name: str = "ShortGic"
@@ -37,6 +89,62 @@ class Settings(BaseSettings):
     # URL validation
     max_url_length: int = 2048
 
+    # Bulk resolve configuration
+    resolve_max_links: int = 1000
+    resolve_chunk_size: int = 500
+
+    # Link cache configuration
+    cache_size: int = 10000
+    cache_ttl: int = 60
+    cache_snapshot_path: str = ""
+    cache_snapshot_size: int = 1000
+    cache_snapshot_max_age: int = 86400
+
+    # Storage compression configuration
+    compression_enabled: bool = False
+    compression_dictionary_path: str = ""
+    compression_dictionary_dir: str = ""
+
+    # Load shedding configuration
+    load_shedding_enabled: bool = True
+    write_concurrency_min: int = 1
+    write_concurrency_max: int = 16
+    read_latency_target_ms: float = 50.0
+    max_queue_depth: int = 64
+    retry_after: int = 1
+
+    # Database maintenance configuration
+    maintenance_enabled: bool = True
+    maintenance_checkpoint_interval: int = 60
+    maintenance_truncate_every: int = 10
+    maintenance_optimize_interval: int = 3600
+    maintenance_vacuum_interval: int = 600
+    maintenance_vacuum_pages: int = 64
+    maintenance_vacuum_pause_ms: int = 50
+    maintenance_compact_interval: int = 3600
+
+    # Change feed configuration
+    changelog_retention: int = 604800
+    changelog_max_rows: int = 1000000
+    changes_page_size: int = 1000
+    changes_max_wait: int = 30
+    changes_poll_interval_ms: int = 500
+
+    # Access log configuration
+    access_log_enabled: bool = False
+    access_log_path: str = ""
+    access_log_sample_rate: float = 1.0
+    access_log_buffer_size: int = 10000
+    access_log_flush_interval_ms: int = 1000
+
+    # Dead target scanner configuration
+    scanner_concurrency: int = 100
+    scanner_per_host_concurrency: int = 4
+    scanner_per_host_interval_ms: int = 100
+    scanner_timeout: float = 10.0
+    scanner_max_redirects: int = 10
+    scanner_chunk_size: int = 1000
+
     model_config = ConfigDict(env_file=".env", env_prefix="SHORTGIC_")
 
 
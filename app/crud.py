@@ -5,16 +5,45 @@ updating, and deleting short links. All functions include proper error
 handling and use cryptographically secure random generation.
 """
 
+import hashlib
 import secrets
 import string
-from typing import Optional, Union
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from fastapi import HTTPException
 from pydantic import HttpUrl
+from sqlalchemy import bindparam, delete, func, select
+from sqlalchemy.ext.horizontal_shard import set_shard_id
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.config import settings
+from app.database import shard_id_for
+
+# Pre-built Core statement for the redirect hot path. Built once at import time
+# so SQLAlchemy's compiled cache is hit on every call without re-constructing
+# the statement, and only the ``target`` column is fetched.
+_TARGET_BY_LINK = select(models.Link.target).where(
+    models.Link.link == bindparam("link")
+)
+_TARGETS_BY_LINKS = select(models.Link.link, models.Link.target).where(
+    models.Link.link.in_(bindparam("links", expanding=True))
+)
+_TARGETS_EXTRAS_BY_LINKS = select(
+    models.Link.link, models.Link.target, models.Link.extras
+).where(models.Link.link.in_(bindparam("links", expanding=True)))
+_CHANGES_SINCE = (
+    select(models.LinkChange)
+    .where(models.LinkChange.seq > bindparam("since"))
+    .order_by(models.LinkChange.seq)
+    .limit(bindparam("limit"))
+)
+_OLDEST_CHANGE = select(func.min(models.LinkChange.seq))
+_LATEST_CHANGE = select(func.max(models.LinkChange.seq))
+_DELETE_CHECK = delete(models.LinkCheck).where(
+    models.LinkCheck.link == bindparam("link")
+)
 
 
 def get_link(db: Session, link: str) -> Optional[models.Link]:
@@ -29,7 +58,64 @@ def get_link(db: Session, link: str) -> Optional[models.Link]:
     Returns:
         Optional[models.Link]: The link record if found, None otherwise.
     """
-    return db.query(models.Link).filter(models.Link.link == link).first()
+    return (
+        db.query(models.Link)
+        .filter(models.Link.link == link)
+        .options(set_shard_id(shard_id_for(link)))
+        .first()
+    )
+
+
+def get_link_target(db: Session, link: str) -> Optional[str]:
+    """Retrieve only the target URL of a short link.
+
+    Lean read path used by redirects. Executes a pre-built Core statement on the
+    session's connection, skipping ORM object construction, identity-map
+    bookkeeping and decoding of the ``extras`` JSON column.
+
+    Args:
+        db: Database session providing the connection.
+        link: The short link identifier to search for.
+
+    Returns:
+        Optional[str]: The target URL if found, None otherwise.
+    """
+    connection = db.connection(bind_arguments={"shard_id": shard_id_for(link)})
+    return connection.execute(_TARGET_BY_LINK, {"link": link}).scalar()
+
+
+def get_links(
+    db: Session, links: Iterable[str], include_extras: bool = False
+) -> Dict[str, Tuple[str, Optional[Dict[str, Any]]]]:
+    """Retrieve the targets of many short links at once.
+
+    Groups the identifiers by shard and looks them up with ``IN`` queries of at
+    most ``settings.resolve_chunk_size`` links each, using the same lean Core
+    path as redirects. Identifiers that do not exist are absent from the result.
+
+    Args:
+        db: Database session providing the connection.
+        links: The short link identifiers to search for.
+        include_extras: Whether to also load the ``extras`` column.
+
+    Returns:
+        Dict[str, Tuple[str, Optional[Dict[str, Any]]]]: Mapping of found link
+            identifiers to their target URL and extras (None when not loaded).
+    """
+    by_shard: Dict[str, list] = {}
+    for link in dict.fromkeys(links):
+        by_shard.setdefault(shard_id_for(link), []).append(link)
+    stmt = _TARGETS_EXTRAS_BY_LINKS if include_extras else _TARGETS_BY_LINKS
+    chunk_size = settings.resolve_chunk_size
+
+    found = {}
+    for shard_id, shard_links in by_shard.items():
+        connection = db.connection(bind_arguments={"shard_id": shard_id})
+        for start in range(0, len(shard_links), chunk_size):
+            chunk = shard_links[start : start + chunk_size]
+            for row in connection.execute(stmt, {"links": chunk}):
+                found[row[0]] = (row[1], row[2] if include_extras else None)
+    return found
 
 
 def get_link_by_target(
@@ -38,7 +124,12 @@ def get_link_by_target(
     """Retrieve a short link record by its target URL.
 
     Searches the database for a link record with the specified target URL.
-    Useful for preventing duplicate URLs from being shortened.
+    Useful for preventing duplicate URLs from being shortened. Links are routed
+    by identifier, so with sharding this query fans out to every shard.
+
+    Targets are matched on the indexed hash of their plain form, so plain and
+    compressed rows are found alike whatever the compression settings or
+    dictionary they were written with.
 
     Args:
         db: Database session for executing the query.
@@ -49,7 +140,23 @@ def get_link_by_target(
     """
     # Convert HttpUrl to string if needed
     target_str = str(target) if hasattr(target, "__str__") else target
-    return db.query(models.Link).filter(models.Link.target == target_str).first()
+    return (
+        db.query(models.Link)
+        .filter(models.Link.target_hash == target_hash(target_str))
+        .first()
+    )
+
+
+def target_hash(target: str) -> str:
+    """Return the hex SHA-256 digest of a target URL used for deduplication.
+
+    Args:
+        target: The plain target URL.
+
+    Returns:
+        str: The 64 characters hex digest.
+    """
+    return hashlib.sha256(target.encode()).hexdigest()
 
 
 def generate_unique_link(db: Session) -> str:
@@ -77,7 +184,10 @@ def generate_unique_link(db: Session) -> str:
         ).upper()
         # Use EXISTS query for better performance
         exists = (
-            db.query(models.Link.id).filter(models.Link.link == shortened).first()
+            db.query(models.Link.id)
+            .filter(models.Link.link == shortened)
+            .options(set_shard_id(shard_id_for(shortened)))
+            .first()
             is not None
         )
         if not exists:
@@ -91,6 +201,7 @@ def create_link(db: Session, link: schemas.Link) -> models.Link:
 
     Generates a cryptographically secure unique identifier and stores the link
     information in the database. Ensures link uniqueness and handles collisions.
+    A ``create`` change is appended to the changelog in the same transaction.
 
     Args:
         db: Database session for executing the transaction.
@@ -110,8 +221,22 @@ def create_link(db: Session, link: schemas.Link) -> models.Link:
     target_str = str(link.target)
 
     try:
-        db_link = models.Link(link=shortened, target=target_str, extras=link.extras)
+        db_link = models.Link(
+            link=shortened,
+            target=target_str,
+            target_hash=target_hash(target_str),
+            extras=link.extras,
+        )
         db.add(db_link)
+        db.add(
+            models.LinkChange(
+                link=shortened,
+                operation="create",
+                target=target_str,
+                extras=link.extras,
+                created_at=time.time(),
+            )
+        )
         db.commit()
         db.refresh(db_link)
         return db_link
@@ -124,7 +249,9 @@ def delete_link(db: Session, link: str) -> Optional[models.Link]:
     """Delete a short link record from the database.
 
     Removes the specified link record from the database permanently.
-    This operation cannot be undone.
+    This operation cannot be undone. A ``delete`` change is appended to the
+    changelog and the dead target scanner result is removed in the same
+    transaction, so a later link reusing the identifier starts unchecked.
 
     Args:
         db: Database session for executing the transaction.
@@ -136,14 +263,84 @@ def delete_link(db: Session, link: str) -> Optional[models.Link]:
     Raises:
         HTTPException: 500 if database transaction fails, with automatic rollback.
     """
-    db_link = db.query(models.Link).filter(models.Link.link == link).first()
+    db_link = get_link(db, link)
     if not db_link:
         return None
 
     try:
         db.delete(db_link)
+        db.add(models.LinkChange(link=link, operation="delete", created_at=time.time()))
+        db.connection(bind_arguments={"shard_id": shard_id_for(link)}).execute(
+            _DELETE_CHECK, {"link": link}
+        )
         db.commit()
         return db_link
     except Exception:
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to delete link")
+
+
+def get_changes(
+    db: Session, since: List[int], limit: int
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Retrieve changelog entries recorded after a cursor.
+
+    Each shard numbers its changes independently, so the cursor holds the last
+    sequence number seen on every shard. Changes from all shards are merged in
+    time order.
+
+    Args:
+        db: Database session providing the connections.
+        since: Last sequence number seen, one per shard.
+        limit: Maximum number of changes to return.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], List[int]]: The changes, and the cursor to
+            pass to the next call.
+
+    Raises:
+        HTTPException: 410 if changes after the cursor were already compacted.
+            The detail ``head`` is the cursor of the latest change, to follow
+            the feed from once the consumer has resynchronized.
+    """
+    per_shard = []
+    for shard, seq in enumerate(since):
+        connection = db.connection(bind_arguments={"shard_id": str(shard)})
+        oldest = connection.execute(_OLDEST_CHANGE).scalar()
+        if oldest is not None and oldest > seq + 1:
+            head = [
+                db.connection(bind_arguments={"shard_id": str(shard_id)})
+                .execute(_LATEST_CHANGE)
+                .scalar()
+                or 0
+                for shard_id in range(len(since))
+            ]
+            raise HTTPException(
+                status_code=410,
+                detail={
+                    "error": "cursor_expired",
+                    "message": "Changes after this cursor were compacted",
+                    "head": ",".join(str(latest) for latest in head),
+                },
+            )
+        rows = connection.execute(_CHANGES_SINCE, {"since": seq, "limit": limit})
+        per_shard.append([{"shard": shard, **row._asdict()} for row in rows])
+
+    # Pick the oldest changes overall, but always a prefix of each shard's
+    # changes so the cursor never skips one if clocks are not monotonic
+    merged = sorted(
+        (change for changes in per_shard for change in changes),
+        key=lambda change: change["created_at"],
+    )[:limit]
+    taken = [0] * len(since)
+    for change in merged:
+        taken[change["shard"]] += 1
+
+    changes = []
+    cursor = list(since)
+    for shard, count in enumerate(taken):
+        changes.extend(per_shard[shard][:count])
+        if count:
+            cursor[shard] = per_shard[shard][count - 1]["seq"]
+    changes.sort(key=lambda change: change["created_at"])
+    return changes, cursor
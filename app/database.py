@@ -5,9 +5,13 @@ and ensures database file creation. Provides the database engine,
 session factory, and base model class for the application.
 """
 
+import zlib
 from pathlib import Path
+from typing import List, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import bindparam, create_engine, event, inspect, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.horizontal_shard import ShardedSession
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 # Import configuration
@@ -37,19 +41,158 @@ def ensure_database_exists(database_path: str) -> None:
         db_path.touch()
 
 
+def shard_database_path(database_path: str, shard_id: int, shard_count: int) -> str:
+    """Return the database file path of a shard.
+
+    Without sharding the configured path is used as is. With sharding, the
+    shard number is inserted before the suffix (``shortgic.db`` becomes
+    ``shortgic.0.db``, ``shortgic.1.db``, ...).
+
+    Args:
+        database_path: Configured SQLite database file path.
+        shard_id: Shard number, from 0 to ``shard_count - 1``.
+        shard_count: Total number of shards.
+
+    Returns:
+        str: Path to the shard database file.
+    """
+    if shard_count <= 1:
+        return database_path
+    path = Path(database_path)
+    return str(path.with_name(f"{path.stem}.{shard_id}{path.suffix}"))
+
+
+def shard_for(key: str, shard_count: Optional[int] = None) -> int:
+    """Return the shard holding a short link identifier.
+
+    Uses CRC32 rather than ``hash()`` so the mapping is stable across processes
+    and restarts.
+
+    Args:
+        key: The short link identifier to route.
+        shard_count: Number of shards, defaults to ``settings.shard_count``.
+
+    Returns:
+        int: Shard number, from 0 to ``shard_count - 1``.
+    """
+    if shard_count is None:
+        shard_count = settings.shard_count
+    if shard_count <= 1:
+        return 0
+    return zlib.crc32(key.encode()) % shard_count
+
+
+def shard_id_for(key: str) -> str:
+    """Return the session shard identifier of a short link identifier.
+
+    Sharded sessions key their shards by string: SQLAlchemy treats a falsy
+    identity token such as ``0`` as missing, which would send refreshes of
+    shard 0 rows to every shard.
+
+    Args:
+        key: The short link identifier to route.
+
+    Returns:
+        str: Shard identifier to pass as ``shard_id`` to the session.
+    """
+    return str(shard_for(key))
+
+
+def create_sqlite_engine(database_path: str) -> Engine:
+    """Create a SQLAlchemy engine for a SQLite database file.
+
+    Args:
+        database_path: Path to the SQLite database file.
+
+    Returns:
+        Engine: Engine bound to the database file, created if missing.
+    """
+    # Ensure database file exists before creating engine
+    ensure_database_exists(database_path)
+
+    engine = create_engine(
+        # Required with SQLite3 because it's not multi-threaded
+        f"sqlite:///{database_path}",
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configure each new SQLite connection for online maintenance.
+
+    Incremental auto-vacuum only takes effect on databases created after it
+    is set; existing files need a one-off ``VACUUM`` to switch.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    if settings.database_journal_mode:
+        cursor.execute(f"PRAGMA journal_mode={settings.database_journal_mode}")
+    cursor.close()
+
+
+def make_session_factory(engines: List[Engine]) -> sessionmaker:
+    """Create the request session factory for a list of shard engines.
+
+    A single engine gets a plain session. Several engines get a
+    ``ShardedSession``: new links are written to the shard of their identifier,
+    queries routed by the ``crud`` functions with a ``shard_id`` hit one shard,
+    and unrouted queries fan out to every shard.
+
+    Args:
+        engines: Shard engines, indexed by shard number.
+
+    Returns:
+        sessionmaker: Session factory for request sessions.
+    """
+    if len(engines) == 1:
+        return sessionmaker(autocommit=False, autoflush=False, bind=engines[0])
+
+    shard_ids = [str(shard_id) for shard_id in range(len(engines))]
+
+    def shard_chooser(mapper, instance, clause=None):
+        if instance is not None:
+            return str(shard_for(instance.link, len(engines)))
+        # Operations without an instance or explicit shard_id use shard 0
+        return shard_ids[0]
+
+    def identity_chooser(mapper, primary_key, **kw):
+        # Primary keys are per-shard autoincrement values
+        return shard_ids
+
+    def execute_chooser(context):
+        return shard_ids
+
+    return sessionmaker(
+        class_=ShardedSession,
+        autocommit=False,
+        autoflush=False,
+        shards=dict(zip(shard_ids, engines)),
+        shard_chooser=shard_chooser,
+        identity_chooser=identity_chooser,
+        execute_chooser=execute_chooser,
+    )
+
+
 # Path to the SQLite3 database
 database_path = settings.database_path
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{database_path}"
 
-# Ensure database file exists before creating engine
-ensure_database_exists(database_path)
+# One engine and session factory per shard, a single one without sharding
+shard_engines = [
+    create_sqlite_engine(
+        shard_database_path(database_path, shard_id, settings.shard_count)
+    )
+    for shard_id in range(max(settings.shard_count, 1))
+]
+ShardSessionLocal = [
+    sessionmaker(autocommit=False, autoflush=False, bind=shard_engine)
+    for shard_engine in shard_engines
+]
 
-engine = create_engine(
-    # Required with SQLite3 because it's not multi-threaded
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = shard_engines[0]
+SessionLocal = make_session_factory(shard_engines)
 
 Base = declarative_base()
 
@@ -64,5 +207,67 @@ def create_tables():
     # Import models to register them with Base metadata
     from app import models  # noqa: F401
 
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    # Create all tables on every shard
+    for shard_engine in shard_engines:
+        Base.metadata.create_all(bind=shard_engine)
+        upgrade_schema(shard_engine)
+
+
+def upgrade_schema(engine: Engine, batch_size: int = 500) -> int:
+    """Bring the tables of an existing database up to date with the models.
+
+    Adds the ``target_hash`` column to ``links`` tables created before it
+    existed, then fills it in for rows without one, such as rows written by
+    older versions or outside the application. Indexes on ``target`` itself,
+    unused since duplicates are found through the hash, are dropped.
+
+    Args:
+        engine: Engine of the database to upgrade.
+        batch_size: Number of rows hashed per transaction.
+
+    Returns:
+        int: Number of rows whose target hash was filled in.
+    """
+    from app import crud, models
+
+    links = models.Link.__table__
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("links")}
+    indexes = {index["name"] for index in inspector.get_indexes("links")}
+    if "target_hash" not in columns:
+        with engine.begin() as connection:
+            connection.execute(
+                text("ALTER TABLE links ADD COLUMN target_hash VARCHAR(64)")
+            )
+            connection.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_links_target_hash "
+                    "ON links (target_hash)"
+                )
+            )
+    unused = indexes & {"ix_links_target", "ix_target_hash"}
+    if unused:
+        with engine.begin() as connection:
+            for index in sorted(unused):
+                connection.execute(text(f"DROP INDEX {index}"))
+
+    filled = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select(links.c.id, links.c.target)
+                .where(links.c.target_hash.is_(None))
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return filled
+            connection.execute(
+                update(links)
+                .where(links.c.id == bindparam("row_id"))
+                .values(target_hash=bindparam("hash")),
+                [
+                    {"row_id": row.id, "hash": crud.target_hash(row.target)}
+                    for row in rows
+                ],
+            )
+            filled += len(rows)
@@ -0,0 +1,201 @@
+"""Adaptive load shedding that keeps redirects fast under overload.
+
+This module provides an AIMD concurrency limiter for write requests and the
+ASGI middleware applying it. Redirects and other reads are never rejected:
+their observed latency drives the write limit down when it exceeds the target,
+and writes over the limit get an immediate 503 with a Retry-After header
+instead of queueing in the threadpool ahead of redirects.
+"""
+
+import json
+import time
+from typing import Callable, Dict, Union
+
+from app.config import settings
+
+# Requests that are never shed, besides GET and HEAD
+READ_PATHS = {("POST", "/resolve")}
+
+# Long-polling paths, whose latency says nothing about the service load
+UNTRACKED_PATHS = {"/changes"}
+
+# Weight of the latest sample in the latency moving averages
+EWMA_WEIGHT = 0.1
+
+# Factor applied to the write limit when reads are over their latency target
+DECREASE_FACTOR = 0.9
+
+# Seconds between two decreases, and without reads before their latency resets
+WINDOW = 1.0
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter for low priority requests.
+
+    The write limit grows by one per window of completed writes while reads
+    stay under their latency target, and shrinks multiplicatively, scaled by
+    how far over target they are, at most once per ``window`` seconds when
+    they do not. The read latency average is reset when no read completed for
+    a whole window, so a write-only period is not judged on old reads. Only
+    used from the event loop, so no locking is needed.
+
+    Attributes:
+        limit: Current maximum number of concurrent writes.
+        reads_in_flight: Number of reads being processed.
+        writes_in_flight: Number of writes being processed.
+        read_latency: Moving average of read latency in seconds.
+        write_latency: Moving average of write latency in seconds.
+        shed: Number of writes rejected since startup.
+    """
+
+    def __init__(
+        self,
+        min_limit: int,
+        max_limit: int,
+        read_latency_target: float,
+        max_queue_depth: int,
+        window: float = WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.read_latency_target = read_latency_target
+        self.max_queue_depth = max_queue_depth
+        self.window = window
+        self.clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset the limit, counters and latency averages."""
+        self.limit = float(self.max_limit)
+        self.reads_in_flight = 0
+        self.writes_in_flight = 0
+        self.read_latency = 0.0
+        self.write_latency = 0.0
+        self.shed = 0
+        self._last_read = float("-inf")
+        self._last_decrease = float("-inf")
+
+    def start_read(self) -> None:
+        """Record the start of a read."""
+        self.reads_in_flight += 1
+
+    def finish_read(self, latency: float) -> None:
+        """Record a completed read and its latency in seconds."""
+        self.reads_in_flight -= 1
+        self.read_latency += EWMA_WEIGHT * (latency - self.read_latency)
+        self._last_read = self.clock()
+
+    def try_start_write(self) -> bool:
+        """Admit a write if under the limit and queue depth, or count it shed."""
+        queue_depth = self.reads_in_flight + self.writes_in_flight
+        if self.writes_in_flight >= int(self.limit) or (
+            queue_depth >= self.max_queue_depth
+        ):
+            self.shed += 1
+            return False
+        self.writes_in_flight += 1
+        return True
+
+    def finish_write(self, latency: float) -> None:
+        """Record a completed write and adjust the limit."""
+        self.writes_in_flight -= 1
+        self.write_latency += EWMA_WEIGHT * (latency - self.write_latency)
+
+        now = self.clock()
+        if not self.reads_in_flight and now - self._last_read >= self.window:
+            # No recent reads, the average no longer reflects the service load
+            self.read_latency = 0.0
+
+        if self.read_latency > self.read_latency_target:
+            if now - self._last_decrease >= self.window:
+                self._last_decrease = now
+                gradient = self.read_latency_target / self.read_latency
+                self.limit = max(
+                    self.min_limit, self.limit * max(gradient, DECREASE_FACTOR)
+                )
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Return the limiter state for the metrics endpoint."""
+        return {
+            "write_limit": int(self.limit),
+            "reads_in_flight": self.reads_in_flight,
+            "writes_in_flight": self.writes_in_flight,
+            "read_latency_ms": round(self.read_latency * 1000, 3),
+            "write_latency_ms": round(self.write_latency * 1000, 3),
+            "writes_shed": self.shed,
+        }
+
+
+limiter = AdaptiveLimiter(
+    min_limit=settings.write_concurrency_min,
+    max_limit=settings.write_concurrency_max,
+    read_latency_target=settings.read_latency_target_ms / 1000,
+    max_queue_depth=settings.max_queue_depth,
+)
+
+
+class LoadSheddingMiddleware:
+    """ASGI middleware classifying requests and shedding writes on overload.
+
+    Args:
+        app: The wrapped ASGI application.
+        limiter: Limiter deciding which writes are admitted.
+    """
+
+    def __init__(self, app, limiter: AdaptiveLimiter) -> None:
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.load_shedding_enabled
+            or scope["path"] in UNTRACKED_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        is_read = method in ("GET", "HEAD") or (method, scope["path"]) in READ_PATHS
+
+        if is_read:
+            self.limiter.start_read()
+        elif not self.limiter.try_start_write():
+            await self._reject(send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            latency = time.perf_counter() - start
+            if is_read:
+                self.limiter.finish_read(latency)
+            else:
+                self.limiter.finish_write(latency)
+
+    async def _reject(self, send) -> None:
+        """Send a 503 response in the API error format."""
+        body = json.dumps(
+            {
+                "detail": {
+                    "error": "overloaded",
+                    "message": "The service is overloaded, retry later",
+                }
+            }
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(settings.retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -4,15 +4,22 @@ This module contains the main FastAPI application with all API endpoints
 for the ShortGic URL shortener service.
 """
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import Annotated, Any, Dict
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 
 from app import crud, schemas, utils
+from app.access_log import AccessLogMiddleware, access_logger
+from app.cache import link_cache, load_snapshot, save_snapshot
+from app.config import settings
 from app.database import SessionLocal, create_tables
+from app.load_shedding import LoadSheddingMiddleware, limiter
+from app.maintenance import maintenance
 
 
 @asynccontextmanager
@@ -20,7 +27,10 @@ async def lifespan(app: FastAPI):
     """Manage FastAPI application lifespan events.
 
     Handles startup and shutdown events for the application.
-    On startup, creates the database schema.
+    On startup, creates the database schema, warms the link cache from the
+    snapshot and starts the database maintenance scheduler and access log
+    writer. On shutdown, stops them and writes the hottest cached links to the
+    snapshot.
 
     Args:
         app: The FastAPI application instance.
@@ -30,8 +40,38 @@ async def lifespan(app: FastAPI):
     """
     # Startup: Create the database schema
     create_tables()
+    if settings.cache_snapshot_path:
+        with SessionLocal() as db:
+            load_snapshot(
+                link_cache,
+                db,
+                settings.cache_snapshot_path,
+                settings.cache_snapshot_max_age,
+            )
+    maintenance_task = None
+    if settings.maintenance_enabled:
+        await maintenance.refresh_stats()
+        maintenance_task = asyncio.create_task(maintenance.run())
+    if settings.access_log_enabled:
+        access_logger.start()
     yield
-    # Shutdown: Add cleanup logic here if needed
+    # Shutdown: Stop the background work and persist the hot set, even if the
+    # maintenance task ended with an error
+    try:
+        if maintenance_task is not None:
+            maintenance_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await maintenance_task
+    finally:
+        try:
+            await run_in_threadpool(access_logger.stop)
+        finally:
+            if settings.cache_snapshot_path:
+                save_snapshot(
+                    link_cache,
+                    settings.cache_snapshot_path,
+                    settings.cache_snapshot_size,
+                )
 
 
 app = FastAPI(
@@ -46,6 +86,8 @@ app = FastAPI(
     },
     lifespan=lifespan,
 )
+app.add_middleware(LoadSheddingMiddleware, limiter=limiter)
+app.add_middleware(AccessLogMiddleware, logger=access_logger)
 
 
 def get_db():
@@ -90,6 +132,85 @@ def root() -> Dict[str, Any]:
     return payload
 
 
+@app.get("/metrics")
+def metrics() -> Dict[str, Any]:
+    """Get runtime metrics of the service.
+
+    Returns the state of the adaptive load shedding limiter, the link cache and
+    access log counters and the page usage of the database files, for scraping
+    by monitoring systems.
+
+    Returns:
+        Dict[str, Any]: Metrics grouped by component.
+    """
+    return {
+        "load_shedding": limiter.stats(),
+        "cache": link_cache.stats(),
+        "access_log": access_logger.stats(),
+        "databases": maintenance.stats,
+    }
+
+
+@app.get("/changes", response_model=schemas.ChangesResponse)
+async def get_changes(
+    db: DbDependency,
+    since: str = "0",
+    limit: Annotated[int, Query(ge=1, le=settings.changes_page_size)] = 100,
+    wait: Annotated[int, Query(ge=0, le=settings.changes_max_wait)] = 0,
+) -> schemas.ChangesResponse:
+    """Get the link changes recorded after a cursor.
+
+    Lets caches and replicas follow link creations and deletions incrementally.
+    The cursor holds the last sequence number seen on each shard, comma
+    separated; a single number applies to every shard. When no change is
+    available, the request is held for up to ``wait`` seconds (long poll).
+
+    Args:
+        db: Database session dependency for database operations.
+        since: Cursor returned as ``next`` by the previous call, ``0`` to start.
+        limit: Maximum number of changes to return, capped to the configured
+            page size.
+        wait: Seconds to wait for changes when there are none yet.
+
+    Returns:
+        ChangesResponse: The changes and the cursor of the next request.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+        HTTPException: 410 if changes after the cursor were compacted and the
+            consumer must resynchronize from scratch, then follow the feed
+            from the ``head`` cursor given in the error detail.
+    """
+    shard_count = max(settings.shard_count, 1)
+    try:
+        cursor = [int(seq) for seq in since.split(",")]
+    except ValueError:
+        cursor = []
+    if len(cursor) == 1:
+        cursor *= shard_count
+    if len(cursor) != shard_count or min(cursor) < 0:
+        raise HTTPException(
+            status_code=400,
+            detail=utils.create_error_detail(
+                "invalid_cursor",
+                f"Cursor must be one or {shard_count} comma separated numbers",
+            ),
+        )
+
+    # Defaults are not validated, so the cap also applies to them
+    limit = min(limit, settings.changes_page_size)
+    deadline = asyncio.get_running_loop().time() + wait
+    while True:
+        changes, cursor = await run_in_threadpool(crud.get_changes, db, cursor, limit)
+        if changes or asyncio.get_running_loop().time() >= deadline:
+            break
+        # Release the read transaction so polls see new commits
+        await run_in_threadpool(db.rollback)
+        await asyncio.sleep(settings.changes_poll_interval_ms / 1000)
+
+    return {"changes": changes, "next": ",".join(str(seq) for seq in cursor)}
+
+
 @app.post("/", response_model=schemas.LinkResponse, status_code=201)
 def create_link(link: schemas.Link, db: DbDependency) -> schemas.LinkResponse:
     """Create a new shortened link from a target URL.
@@ -125,6 +246,43 @@ def create_link(link: schemas.Link, db: DbDependency) -> schemas.LinkResponse:
     return {"link": response.link}
 
 
+@app.post("/resolve", response_model=schemas.ResolveResponse)
+def resolve_links(
+    request: schemas.ResolveRequest, db: DbDependency
+) -> schemas.ResolveResponse:
+    """Resolve many short links to their targets in a single call.
+
+    Validates every identifier, serves what it can from the link cache, then
+    fetches the rest with chunked ``IN`` queries instead of one lookup per
+    link. Each requested identifier gets its own status so a single bad code
+    does not fail the whole batch.
+
+    Args:
+        request: Resolve request containing the links and options.
+        db: Database session dependency for database operations.
+
+    Returns:
+        ResolveResponse: Resolution result keyed by requested link identifier.
+    """
+    results = {}
+    valid = []
+    for link in request.links:
+        if utils.is_valid_link_format(link):
+            valid.append(link)
+        else:
+            results[link] = {"status": "invalid_link_format"}
+
+    found = utils.get_cached_links(db, valid, include_extras=request.include_extras)
+    for link in valid:
+        if link in found:
+            target, extras = found[link]
+            results[link] = {"status": "found", "target": target, "extras": extras}
+        else:
+            results[link] = {"status": "not_found"}
+
+    return {"results": results}
+
+
 @app.get("/{link}", status_code=302)
 def get_link(link: str, db: DbDependency) -> RedirectResponse:
     """Redirect to the target URL associated with the short link.
@@ -144,8 +302,8 @@ def get_link(link: str, db: DbDependency) -> RedirectResponse:
             contains non-alphanumeric characters).
         HTTPException: 404 if the short link does not exist in the database.
     """
-    db_link = utils.get_link_or_404(db, link)
-    return RedirectResponse(url=db_link.target, status_code=302)
+    target = utils.get_link_target_or_404(db, link)
+    return RedirectResponse(url=target, status_code=302)
 
 
 @app.get("/{link}/info", response_model=schemas.Link)
@@ -192,4 +350,5 @@ def delete_link(link: str, db: DbDependency) -> None:
     """
     utils.get_link_or_404(db, link)
     crud.delete_link(db=db, link=link)
+    link_cache.invalidate(link)
     return None
@@ -0,0 +1,234 @@
+"""Background maintenance of the SQLite database files.
+
+This module provides the maintenance jobs (WAL checkpoints, query planner
+statistics, changelog compaction and incremental vacuum) and the scheduler
+running them from the application lifespan. Jobs run in a worker thread, one
+shard at a time, and the vacuum frees pages in small batches with pauses in
+between so the write lock is never held long enough to delay redirects.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from app import models
+from app.config import settings
+from app.database import shard_engines
+
+logger = logging.getLogger(__name__)
+
+
+def checkpoint(engine: Engine, mode: str = "PASSIVE") -> Dict[str, int]:
+    """Checkpoint the write-ahead log of a database.
+
+    Args:
+        engine: Engine of the database to checkpoint.
+        mode: ``PASSIVE`` never waits on readers or writers, ``TRUNCATE`` also
+            resets the WAL file to zero bytes when it can.
+
+    Returns:
+        Dict[str, int]: Whether the checkpoint was blocked, the WAL size and
+            the number of checkpointed frames, in pages.
+    """
+    with engine.connect() as connection:
+        busy, log, checkpointed = connection.exec_driver_sql(
+            f"PRAGMA wal_checkpoint({mode})"
+        ).one()
+    return {"busy": busy, "log": log, "checkpointed": checkpointed}
+
+
+def optimize(engine: Engine) -> None:
+    """Refresh query planner statistics where SQLite deems it useful.
+
+    ``analysis_limit`` bounds the rows ANALYZE scans per index, keeping the
+    run short on large tables.
+
+    Args:
+        engine: Engine of the database to optimize.
+    """
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA analysis_limit=400")
+        connection.exec_driver_sql("PRAGMA optimize")
+
+
+def compact_changelog(engine: Engine, retention: int, max_rows: int) -> int:
+    """Delete changelog entries older than the retention or over the row cap.
+
+    The latest change is always kept so sequence numbers keep increasing and
+    consumers behind the compacted range can be told to resynchronize.
+
+    Args:
+        engine: Engine of the database to compact.
+        retention: Age in seconds after which changes are deleted.
+        max_rows: Number of most recent changes kept at most.
+
+    Returns:
+        int: Number of deleted changes.
+    """
+    changes = models.LinkChange.__table__
+    with engine.begin() as connection:
+        latest = connection.execute(select(func.max(changes.c.seq))).scalar()
+        if latest is None:
+            return 0
+        result = connection.execute(
+            delete(changes).where(
+                and_(
+                    changes.c.seq < latest,
+                    or_(
+                        changes.c.created_at < time.time() - retention,
+                        changes.c.seq <= latest - max_rows,
+                    ),
+                )
+            )
+        )
+        return result.rowcount
+
+
+def incremental_vacuum(engine: Engine, pages: int) -> int:
+    """Free up to ``pages`` pages from the freelist in one short transaction.
+
+    Args:
+        engine: Engine of the database to vacuum.
+        pages: Maximum number of pages to free.
+
+    Returns:
+        int: Number of free pages left, 0 when auto-vacuum is not incremental.
+    """
+    with engine.connect() as connection:
+        if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+            return 0
+        # The pragma frees one page per step without returning rows, and only
+        # executescript steps such a statement until it is done
+        connection.connection.driver_connection.executescript(
+            f"PRAGMA incremental_vacuum({pages})"
+        )
+        return connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+
+
+def database_stats(engine: Engine) -> Dict[str, int]:
+    """Return the page usage of a database.
+
+    Args:
+        engine: Engine of the database to inspect.
+
+    Returns:
+        Dict[str, int]: Page count, free pages and page size in bytes.
+    """
+    with engine.connect() as connection:
+        return {
+            "page_count": connection.exec_driver_sql("PRAGMA page_count").scalar(),
+            "freelist_count": connection.exec_driver_sql(
+                "PRAGMA freelist_count"
+            ).scalar(),
+            "page_size": connection.exec_driver_sql("PRAGMA page_size").scalar(),
+        }
+
+
+class MaintenanceScheduler:
+    """Run the maintenance jobs on every shard at their configured intervals.
+
+    Attributes:
+        engines: Engines of the databases to maintain.
+        last_run: Monotonic time each job last ran.
+        stats: Page usage and last checkpoint result of each database.
+    """
+
+    def __init__(self, engines: List[Engine]) -> None:
+        self.engines = engines
+        self.last_run: Dict[str, float] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self._checkpoints = 0
+
+    def _due(self, job: str, interval: int, now: float) -> bool:
+        """Check whether a job is due, and mark it as run if so."""
+        if interval <= 0:
+            return False
+        if now - self.last_run.setdefault(job, now) < interval:
+            return False
+        self.last_run[job] = now
+        return True
+
+    async def run_pending(self, now: float) -> bool:
+        """Run every job due at ``now``, one database at a time.
+
+        Returns:
+            bool: Whether any job ran.
+        """
+        ran = False
+        if self._due("checkpoint", settings.maintenance_checkpoint_interval, now):
+            ran = True
+            self._checkpoints += 1
+            truncate = settings.maintenance_truncate_every > 0 and (
+                self._checkpoints % settings.maintenance_truncate_every == 0
+            )
+            for shard_id, engine in enumerate(self.engines):
+                result = await asyncio.to_thread(
+                    checkpoint, engine, "TRUNCATE" if truncate else "PASSIVE"
+                )
+                self.stats.setdefault(str(shard_id), {})["checkpoint"] = result
+
+        if self._due("optimize", settings.maintenance_optimize_interval, now):
+            ran = True
+            for engine in self.engines:
+                await asyncio.to_thread(optimize, engine)
+
+        if self._due("compact", settings.maintenance_compact_interval, now):
+            ran = True
+            for engine in self.engines:
+                await asyncio.to_thread(
+                    compact_changelog,
+                    engine,
+                    settings.changelog_retention,
+                    settings.changelog_max_rows,
+                )
+
+        # Vacuum last to reclaim the pages freed by compaction
+        if self._due("vacuum", settings.maintenance_vacuum_interval, now):
+            ran = True
+            for engine in self.engines:
+                await self._vacuum(engine)
+
+        if ran:
+            await self.refresh_stats()
+        return ran
+
+    async def _vacuum(self, engine: Engine) -> None:
+        """Empty the freelist in small batches, pausing between them."""
+        previous = None
+        remaining = await asyncio.to_thread(
+            incremental_vacuum, engine, settings.maintenance_vacuum_pages
+        )
+        # Stop if deletes refill the freelist faster than it is emptied
+        while remaining and (previous is None or remaining < previous):
+            await asyncio.sleep(settings.maintenance_vacuum_pause_ms / 1000)
+            previous = remaining
+            remaining = await asyncio.to_thread(
+                incremental_vacuum, engine, settings.maintenance_vacuum_pages
+            )
+
+    async def refresh_stats(self) -> None:
+        """Refresh the page usage of every database."""
+        for shard_id, engine in enumerate(self.engines):
+            shard_stats = await asyncio.to_thread(database_stats, engine)
+            self.stats.setdefault(str(shard_id), {}).update(shard_stats)
+
+    async def run(self, tick: float = 1.0) -> None:
+        """Run pending jobs forever, until cancelled."""
+        while True:
+            await asyncio.sleep(tick)
+            try:
+                await self.run_pending(time.monotonic())
+            except OperationalError:
+                # Typically a busy database, jobs are retried at their next run
+                continue
+            except Exception:
+                # Keep maintaining the other jobs and shards on unexpected errors
+                logger.exception("Database maintenance run failed")
+
+
+maintenance = MaintenanceScheduler(shard_engines)
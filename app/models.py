@@ -5,8 +5,9 @@ short link data. All models inherit from the declarative base and include
 proper indexing for optimal query performance.
 """
 
-from sqlalchemy import JSON, Column, Index, Integer, String, Text
+from sqlalchemy import Column, Float, Integer, String
 
+from .compression import CompressedJSON, CompressedText
 from .database import Base
 
 
@@ -20,16 +21,72 @@ class Link(Base):
     Attributes:
         id: Primary key auto-increment integer.
         link: Unique short link identifier (indexed for fast lookups).
-        target: The target URL that the short link redirects to (indexed).
-        extras: Optional JSON field for additional metadata or tracking data.
+        target: The target URL that the short link redirects to (compressed
+            when enabled).
+        target_hash: SHA-256 of the plain target URL (indexed), used to find
+            duplicates whatever the stored encoding of the target.
+        extras: Optional JSON field for additional metadata or tracking data
+            (compressed when enabled).
     """
 
     __tablename__ = "links"
 
     id = Column(Integer, primary_key=True, index=True, nullable=False)
     link = Column(String(20), unique=True, index=True, nullable=False)
-    target = Column(Text, index=True, nullable=False)
-    extras = Column(JSON, nullable=True)
+    target = Column(CompressedText, nullable=False)
+    target_hash = Column(String(64), index=True, nullable=True)
+    extras = Column(CompressedJSON, nullable=True)
 
-    # Composite index for efficient duplicate checking
-    __table_args__ = (Index("ix_target_hash", "target"),)  # Optimized target lookup
+
+class LinkChange(Base):
+    """SQLAlchemy model for the link_changes table.
+
+    Append-only changelog of link mutations, written in the same transaction
+    as the mutation itself so downstream caches and replicas can follow it
+    incrementally. With sharding, each shard holds the changes of its own
+    links and numbers them independently.
+
+    Attributes:
+        seq: Monotonic sequence number, never reused even after compaction.
+        link: Short link identifier the change applies to.
+        operation: ``create`` or ``delete``.
+        target: Target URL of created links.
+        extras: Extras of created links.
+        created_at: Unix timestamp of the change.
+    """
+
+    __tablename__ = "link_changes"
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    link = Column(String(20), nullable=False)
+    operation = Column(String(10), nullable=False)
+    target = Column(CompressedText, nullable=True)
+    extras = Column(CompressedJSON, nullable=True)
+    created_at = Column(Float, index=True, nullable=False)
+
+    # AUTOINCREMENT keeps sequence numbers from being reused after compaction
+    __table_args__ = {"sqlite_autoincrement": True}
+
+
+class LinkCheck(Base):
+    """SQLAlchemy model for the link_checks table.
+
+    Latest result of the dead target scanner for each short link, kept apart
+    from ``extras`` so scans do not rewrite user metadata or the changelog.
+
+    Attributes:
+        link: Short link identifier the check applies to.
+        status: ``ok``, ``dead``, ``http_error``, ``redirect_loop`` or
+            ``unreachable``.
+        http_status: Final HTTP status code, when a response was received.
+        error: Error description for failed requests.
+        checked_at: Unix timestamp of the check.
+    """
+
+    __tablename__ = "link_checks"
+
+    link = Column(String(20), primary_key=True)
+    status = Column(String(20), index=True, nullable=False)
+    http_status = Column(Integer, nullable=True)
+    error = Column(String(200), nullable=True)
+    checked_at = Column(Float, nullable=False)
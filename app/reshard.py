@@ -0,0 +1,154 @@
+"""Offline resharding tool for the ShortGic link database.
+
+Moves link rows between SQLite shard files when the number of shards changes,
+along with their dead target scanner results. Rows are copied to their new
+shard before being deleted from the old one, and copies ignore rows already
+present, so an interrupted run can simply be restarted. The service must be
+stopped while resharding.
+
+Usage:
+    python -m app.reshard --from 1 --to 4
+"""
+
+import argparse
+from typing import Dict
+
+from sqlalchemy import delete, select
+
+from app import models
+from app.config import settings
+from app.database import (
+    Base,
+    create_sqlite_engine,
+    shard_database_path,
+    shard_for,
+    upgrade_schema,
+)
+
+
+def reshard(
+    database_path: str, old_count: int, new_count: int, batch_size: int = 500
+) -> Dict[str, int]:
+    """Move links from an ``old_count`` shard layout to a ``new_count`` one.
+
+    Every row is routed with ``shard_for`` against the new shard count. Rows
+    already in the right file stay in place, the others are copied to their
+    new shard and deleted from their old one, one batch at a time, together
+    with their ``link_checks`` rows.
+
+    Args:
+        database_path: Configured SQLite database file path.
+        old_count: Number of shards the data is currently spread across.
+        new_count: Number of shards to spread the data across.
+        batch_size: Number of rows read and moved per transaction.
+
+    Returns:
+        Dict[str, int]: Number of rows moved out of each source shard file.
+    """
+    links = models.Link.__table__
+    checks = models.LinkCheck.__table__
+    engines = {}
+
+    def engine_for(path):
+        if path not in engines:
+            engines[path] = create_sqlite_engine(path)
+            Base.metadata.create_all(bind=engines[path])
+            upgrade_schema(engines[path])
+        return engines[path]
+
+    target_paths = [
+        shard_database_path(database_path, shard_id, new_count)
+        for shard_id in range(new_count)
+    ]
+    for path in target_paths:
+        engine_for(path)
+
+    moved = {}
+    for shard_id in range(old_count):
+        source_path = shard_database_path(database_path, shard_id, old_count)
+        source = engine_for(source_path)
+        moved[source_path] = 0
+        last_id = 0
+
+        while True:
+            with source.connect() as connection:
+                rows = connection.execute(
+                    select(links)
+                    .where(links.c.id > last_id)
+                    .order_by(links.c.id)
+                    .limit(batch_size)
+                ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            # Group the rows that no longer belong to this file by destination
+            outgoing: Dict[str, list] = {}
+            for row in rows:
+                path = target_paths[shard_for(row.link, new_count)]
+                if path != source_path:
+                    outgoing.setdefault(path, []).append(row)
+
+            for path, batch in outgoing.items():
+                codes = [row.link for row in batch]
+                with source.connect() as connection:
+                    batch_checks = connection.execute(
+                        select(checks).where(checks.c.link.in_(codes))
+                    ).all()
+                with engine_for(path).begin() as connection:
+                    if batch_checks:
+                        connection.execute(
+                            checks.insert().prefix_with("OR REPLACE"),
+                            [check._asdict() for check in batch_checks],
+                        )
+                    connection.execute(
+                        links.insert().prefix_with("OR IGNORE"),
+                        [
+                            {
+                                "link": row.link,
+                                "target": row.target,
+                                "target_hash": row.target_hash,
+                                "extras": row.extras,
+                            }
+                            for row in batch
+                        ],
+                    )
+                with source.begin() as connection:
+                    connection.execute(delete(checks).where(checks.c.link.in_(codes)))
+                    connection.execute(
+                        delete(links).where(links.c.id.in_([row.id for row in batch]))
+                    )
+                moved[source_path] += len(batch)
+
+    for engine in engines.values():
+        engine.dispose()
+    return moved
+
+
+def main() -> None:
+    """Parse command line arguments and run the resharding."""
+    parser = argparse.ArgumentParser(description="Reshard the ShortGic database")
+    parser.add_argument(
+        "--from", dest="old_count", type=int, required=True, help="Current shards"
+    )
+    parser.add_argument(
+        "--to", dest="new_count", type=int, required=True, help="Target shards"
+    )
+    parser.add_argument(
+        "--database-path",
+        default=settings.database_path,
+        help="SQLite database file path (default: SHORTGIC_DATABASE_PATH)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="Rows moved per transaction"
+    )
+    args = parser.parse_args()
+
+    moved = reshard(args.database_path, args.old_count, args.new_count, args.batch_size)
+    for path, count in moved.items():
+        print(f"{path}: moved {count} links")
+    print(f"Set SHORTGIC_SHARD_COUNT={args.new_count} before restarting the service.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Dead target scanner for stored short links.
+
+This module checks every stored target URL and records the outcome in the
+``link_checks`` table. Links are streamed from each shard in keyset-paginated
+chunks into a bounded queue consumed by a fixed pool of workers, so memory
+stays flat regardless of the number of links. Requests share a pooled HTTP
+client, are limited per host in concurrency and rate without blocking workers
+on busy hosts, and try HEAD first, falling back to GET for servers that do
+not support it.
+
+Usage:
+    python -m app.scanner --concurrency 200
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+
+from app import models
+from app.config import settings
+from app.database import Base, shard_engines
+
+# HEAD responses meaning the server only refuses the method, not the resource
+HEAD_UNSUPPORTED = {403, 405, 501}
+
+# Statuses of targets that no longer exist
+DEAD_STATUSES = {404, 410}
+
+# Check result: status, final HTTP status code and error description
+CheckResult = Tuple[str, Optional[int], Optional[str]]
+
+
+def iter_link_chunks(engine: Engine, chunk_size: int) -> Iterator[List[Tuple]]:
+    """Yield the links of a database in chunks of ``(link, target)`` rows.
+
+    Uses keyset pagination on the primary key so each chunk is an index range
+    scan, however deep into the table it is.
+
+    Args:
+        engine: Engine of the database to read.
+        chunk_size: Maximum number of links per chunk.
+
+    Yields:
+        List[Tuple]: The next chunk of ``(link, target)`` rows.
+    """
+    links = models.Link.__table__
+    last_id = 0
+    while True:
+        with engine.connect() as connection:
+            rows = connection.execute(
+                select(links.c.id, links.c.link, links.c.target)
+                .where(links.c.id > last_id)
+                .order_by(links.c.id)
+                .limit(chunk_size)
+            ).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield [(row.link, row.target) for row in rows]
+
+
+def save_results(engine: Engine, results: List[Dict]) -> None:
+    """Upsert check results into the ``link_checks`` table.
+
+    Args:
+        engine: Engine of the database the links belong to.
+        results: Rows with the ``LinkCheck`` columns.
+    """
+    stmt = insert(models.LinkCheck.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["link"],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("status", "http_status", "error", "checked_at")
+        },
+    )
+    with engine.begin() as connection:
+        connection.execute(stmt, results)
+
+
+class HostLimiter:
+    """Per-host concurrency and request rate limiter.
+
+    Never waits for a busy host: ``try_acquire`` fails instead, so the caller
+    can set the request aside and keep checking other hosts.
+
+    Args:
+        concurrency: Maximum concurrent requests per host.
+        interval: Minimum delay in seconds between request starts per host.
+    """
+
+    def __init__(self, concurrency: int, interval: float) -> None:
+        self.concurrency = concurrency
+        self.interval = interval
+        self._active: Counter = Counter()
+        self._next_start: Dict[str, float] = {}
+
+    def try_acquire(self, host: str) -> bool:
+        """Take a request slot on ``host`` if one is free."""
+        if self._active[host] >= self.concurrency:
+            return False
+        self._active[host] += 1
+        return True
+
+    async def wait_turn(self, host: str) -> None:
+        """Wait until the next request to ``host`` may start."""
+        # Reserve the next start time before sleeping so requests are spaced out
+        loop = asyncio.get_running_loop()
+        start = max(loop.time(), self._next_start.get(host, 0.0))
+        self._next_start[host] = start + self.interval
+        delay = start - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def release(self, host: str) -> None:
+        """Release a request slot on ``host``."""
+        self._active[host] -= 1
+        if not self._active[host]:
+            del self._active[host]
+            if self._next_start[host] <= asyncio.get_running_loop().time():
+                del self._next_start[host]
+
+
+class DeadTargetScanner:
+    """Check link targets with bounded concurrency and record the results.
+
+    Links whose host already has all its request slots taken are set aside
+    rather than waited for. The worker holding a slot on that host checks them
+    once done with its own link, so a host with many links never ties up more
+    than ``per_host_concurrency`` workers.
+
+    Args:
+        concurrency: Number of concurrent workers, and pooled connections.
+        per_host_concurrency: Maximum concurrent requests per host.
+        per_host_interval: Minimum delay in seconds between requests per host.
+        timeout: Timeout in seconds of each request.
+        max_redirects: Redirects followed before reporting a loop.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        per_host_concurrency: int,
+        per_host_interval: float,
+        timeout: float,
+        max_redirects: int,
+    ) -> None:
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.hosts = HostLimiter(per_host_concurrency, per_host_interval)
+
+    async def check(self, client: httpx.AsyncClient, target: str) -> CheckResult:
+        """Check a single target URL, HEAD first then GET if needed.
+
+        Args:
+            client: Pooled HTTP client.
+            target: The URL to check.
+
+        Returns:
+            CheckResult: Status, final HTTP status code and error description.
+        """
+        try:
+            response = await client.head(target)
+            if response.status_code in HEAD_UNSUPPORTED:
+                # Only read the headers, the body is discarded unread
+                async with client.stream("GET", target) as response:
+                    pass
+        except httpx.TooManyRedirects:
+            return "redirect_loop", None, "Too many redirects"
+        except httpx.HTTPError as error:
+            return "unreachable", None, (str(error) or type(error).__name__)[:200]
+
+        if response.status_code in DEAD_STATUSES:
+            return "dead", response.status_code, None
+        if response.status_code >= 400:
+            return "http_error", response.status_code, None
+        return "ok", response.status_code, None
+
+    async def scan(self, engines: List[Engine], chunk_size: int) -> Counter:
+        """Check the targets of every link of every database.
+
+        Args:
+            engines: Engines of the databases to scan, one per shard.
+            chunk_size: Number of links read and results written at a time.
+
+        Returns:
+            Counter: Number of links per check status.
+        """
+        totals: Counter = Counter()
+        client = httpx.AsyncClient(
+            follow_redirects=True,
+            max_redirects=self.max_redirects,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+        )
+
+        async with client:
+            for engine in engines:
+                await asyncio.to_thread(Base.metadata.create_all, engine)
+                queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+                # Links read but not checked yet, set aside ones included
+                pending = asyncio.Semaphore(max(chunk_size, self.concurrency * 2))
+                deferred: Dict[str, Deque[Tuple]] = {}
+                results: List[Dict] = []
+
+                async def check_item(host: Optional[str], item: Tuple) -> None:
+                    link, target = item
+                    try:
+                        if host is not None:
+                            await self.hosts.wait_turn(host)
+                        status, http_status, error = await self.check(client, target)
+                    except Exception as exc:
+                        # A target that cannot even be requested must not
+                        # stop the worker
+                        status, http_status = "unreachable", None
+                        error = (str(exc) or type(exc).__name__)[:200]
+                    totals[status] += 1
+                    results.append(
+                        {
+                            "link": link,
+                            "status": status,
+                            "http_status": http_status,
+                            "error": error,
+                            "checked_at": time.time(),
+                        }
+                    )
+                    pending.release()
+
+                async def worker() -> None:
+                    while True:
+                        item = await queue.get()
+                        if item is None:
+                            return
+                        try:
+                            host = httpx.URL(item[1]).host or None
+                        except Exception:
+                            # Reported by the request itself
+                            host = None
+                        if host is None:
+                            await check_item(None, item)
+                            continue
+                        if not self.hosts.try_acquire(host):
+                            deferred.setdefault(host, deque()).append(item)
+                            continue
+
+                        # Also check the links set aside while holding the slot
+                        while item is not None:
+                            await check_item(host, item)
+                            waiting = deferred.get(host)
+                            item = waiting.popleft() if waiting else None
+                            if waiting is not None and not waiting:
+                                del deferred[host]
+                        self.hosts.release(host)
+
+                workers = [
+                    asyncio.create_task(worker()) for _ in range(self.concurrency)
+                ]
+                chunks = iter_link_chunks(engine, chunk_size)
+                while True:
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if chunk is None:
+                        break
+                    for item in chunk:
+                        await pending.acquire()
+                        await queue.put(item)
+                    if len(results) >= chunk_size:
+                        batch, results[:] = results[:], []
+                        await asyncio.to_thread(save_results, engine, batch)
+
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+                if results:
+                    await asyncio.to_thread(save_results, engine, results)
+
+        return totals
+
+
+def main() -> None:
+    """Parse command line arguments and scan every stored link."""
+    parser = argparse.ArgumentParser(description="Find dead ShortGic link targets")
+    parser.add_argument("--concurrency", type=int, default=settings.scanner_concurrency)
+    parser.add_argument(
+        "--per-host", type=int, default=settings.scanner_per_host_concurrency
+    )
+    parser.add_argument(
+        "--per-host-interval-ms",
+        type=int,
+        default=settings.scanner_per_host_interval_ms,
+    )
+    parser.add_argument("--timeout", type=float, default=settings.scanner_timeout)
+    parser.add_argument("--chunk-size", type=int, default=settings.scanner_chunk_size)
+    args = parser.parse_args()
+
+    scanner = DeadTargetScanner(
+        concurrency=args.concurrency,
+        per_host_concurrency=args.per_host,
+        per_host_interval=args.per_host_interval_ms / 1000,
+        timeout=args.timeout,
+        max_redirects=settings.scanner_max_redirects,
+    )
+    totals = asyncio.run(scanner.scan(shard_engines, args.chunk_size))
+    for status, count in sorted(totals.items()):
+        print(f"{status}: {count}")
+
+
+if __name__ == "__main__":
+    main()
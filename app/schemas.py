@@ -5,7 +5,7 @@ response serialization, and data transfer objects. Includes input validation
 with configurable limits and standardized error response formats.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 
@@ -46,6 +46,90 @@ class LinkResponse(BaseModel):
     link: str = Field(..., description="Generated short link identifier")
 
 
+class ResolveRequest(BaseModel):
+    """Schema for bulk link resolution requests.
+
+    Attributes:
+        links: Short link identifiers to resolve (bounded by configuration).
+        include_extras: Whether to return the extras of each resolved link.
+    """
+
+    links: List[str] = Field(
+        ...,
+        max_length=settings.resolve_max_links,
+        description="Short link identifiers to resolve",
+    )
+    include_extras: bool = Field(
+        default=False, description="Return the extras of each resolved link"
+    )
+
+
+class ResolvedLink(BaseModel):
+    """Schema for the resolution result of a single short link.
+
+    Attributes:
+        status: ``found``, ``not_found`` or ``invalid_link_format``.
+        target: The target URL when the link was found.
+        extras: The link extras when found and requested.
+    """
+
+    status: Literal["found", "not_found", "invalid_link_format"] = Field(
+        ..., description="Resolution status"
+    )
+    target: Optional[str] = Field(default=None, description="Target URL")
+    extras: Optional[Dict[str, Any]] = Field(
+        default=None, description="Additional metadata for the link"
+    )
+
+
+class ResolveResponse(BaseModel):
+    """Schema for bulk link resolution responses.
+
+    Attributes:
+        results: Resolution result keyed by requested short link identifier.
+    """
+
+    results: Dict[str, ResolvedLink] = Field(
+        ..., description="Resolution result per short link"
+    )
+
+
+class LinkChange(BaseModel):
+    """Schema for a single changelog entry.
+
+    Attributes:
+        seq: Sequence number of the change within its shard.
+        shard: Shard the change was recorded on (0 without sharding).
+        link: Short link identifier the change applies to.
+        operation: ``create`` or ``delete``.
+        target: Target URL of created links.
+        extras: Extras of created links.
+        created_at: Unix timestamp of the change.
+    """
+
+    seq: int = Field(..., description="Sequence number within the shard")
+    shard: int = Field(..., description="Shard the change was recorded on")
+    link: str = Field(..., description="Short link identifier")
+    operation: Literal["create", "delete"] = Field(..., description="Change type")
+    target: Optional[str] = Field(default=None, description="Target URL")
+    extras: Optional[Dict[str, Any]] = Field(
+        default=None, description="Additional metadata for the link"
+    )
+    created_at: float = Field(..., description="Unix timestamp of the change")
+
+
+class ChangesResponse(BaseModel):
+    """Schema for change feed responses.
+
+    Attributes:
+        changes: Changes recorded after the requested cursor, oldest first.
+        next: Cursor to pass as ``since`` to get the following changes.
+    """
+
+    changes: List[LinkChange] = Field(..., description="Link changes")
+    next: str = Field(..., description="Cursor of the next request")
+
+
 class ErrorResponse(BaseModel):
     """Schema for standardized API error responses.
 
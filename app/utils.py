@@ -4,13 +4,28 @@ This module contains reusable helper functions for validation, error handling,
 and common operations used across the application.
 """
 
+from typing import Any, Dict, Iterable, Optional, Tuple
+
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from app import crud, models
+from app.cache import link_cache
 from app.config import settings
 
 
+def is_valid_link_format(link: str) -> bool:
+    """Check whether a short link has the expected format.
+
+    Args:
+        link: The short link identifier to check.
+
+    Returns:
+        bool: True if the link has the configured length and is alphanumeric.
+    """
+    return len(link) == settings.link_length and link.isalnum()
+
+
 def validate_link_format(link: str) -> None:
     """Validate short link format.
 
@@ -23,7 +38,7 @@ def validate_link_format(link: str) -> None:
     Raises:
         HTTPException: 400 if the link format is invalid.
     """
-    if len(link) != settings.link_length or not link.isalnum():
+    if not is_valid_link_format(link):
         raise HTTPException(
             status_code=400,
             detail={
@@ -57,16 +72,93 @@ def get_link_or_404(db: Session, link: str) -> models.Link:
 
     db_link = crud.get_link(db, link=link)
     if db_link is None:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "error": "link_not_found",
-                "message": "The requested short link does not exist",
-            },
-        )
+        raise link_not_found()
     return db_link
 
 
+def get_link_target_or_404(db: Session, link: str) -> str:
+    """Get a link target URL from database or raise 404 if not found.
+
+    Same validation and error handling as ``get_link_or_404`` but only returns
+    the target URL, served from the link cache or the lean read path. Used by
+    the redirect endpoint.
+
+    Args:
+        db: Database session for executing the query.
+        link: The short link identifier to resolve.
+
+    Returns:
+        str: The target URL of the link.
+
+    Raises:
+        HTTPException: 400 if the link format is invalid.
+        HTTPException: 404 if the link does not exist in the database.
+    """
+    validate_link_format(link)
+
+    target = link_cache.get(link)
+    if target is not None:
+        return target
+
+    generation = link_cache.generation()
+    target = crud.get_link_target(db, link=link)
+    if target is None:
+        raise link_not_found()
+    link_cache.put(link, target, generation)
+    return target
+
+
+def get_cached_links(
+    db: Session, links: Iterable[str], include_extras: bool = False
+) -> Dict[str, Tuple[str, Optional[Dict[str, Any]]]]:
+    """Resolve many links, serving targets from the link cache when possible.
+
+    Without extras, only links missing from the cache are fetched from the
+    database. The cache does not hold extras, so requesting them fetches every
+    link. Fetched targets are added to the cache either way.
+
+    Args:
+        db: Database session for executing the queries.
+        links: The short link identifiers to resolve.
+        include_extras: Whether to also load the ``extras`` column.
+
+    Returns:
+        Dict[str, Tuple[str, Optional[Dict[str, Any]]]]: Mapping of found link
+            identifiers to their target URL and extras (None when not loaded).
+    """
+    found = {}
+    misses = []
+    for link in links:
+        target = None if include_extras else link_cache.get(link)
+        if target is None:
+            misses.append(link)
+        else:
+            found[link] = (target, None)
+
+    generation = link_cache.generation()
+    for link, (target, extras) in crud.get_links(
+        db, misses, include_extras=include_extras
+    ).items():
+        link_cache.put(link, target, generation)
+        found[link] = (target, extras)
+    return found
+
+
+def link_not_found() -> HTTPException:
+    """Build the standard 404 exception for a missing short link.
+
+    Returns:
+        HTTPException: 404 exception with the ``link_not_found`` error detail.
+    """
+    return HTTPException(
+        status_code=404,
+        detail={
+            "error": "link_not_found",
+            "message": "The requested short link does not exist",
+        },
+    )
+
+
 def create_error_detail(error_type: str, message: str, **kwargs) -> dict:
     """Create standardized error detail dictionary.
 
@@ -1,8 +1,18 @@
 """Performance tests for ShortGic URL shortener."""
 
+import asyncio
 import time
+import tracemalloc
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
 from starlette.testclient import TestClient
 
+from app import crud, models
+from app.access_log import AccessLogger, AccessLogMiddleware
+from app.config import settings
+from app.database import Base
+
 
 def test_health_check_performance(client: TestClient):
     """Test the health check endpoint performance."""
@@ -66,3 +76,146 @@ def test_delete_link_performance(client: TestClient):
     # Verify it's gone
     response = client.get(f"/{short_link}", follow_redirects=False)
     assert response.status_code == 404
+
+
+def _measure_lookup(session_factory, lookup, iterations=500):
+    """Return per-request CPU time and median peak allocation of a lookup."""
+
+    def request():
+        db = session_factory()
+        try:
+            return lookup(db, "PERFX")
+        finally:
+            db.close()
+
+    # Warm up statement caches before measuring
+    for _ in range(50):
+        request()
+
+    start = time.process_time()
+    for _ in range(iterations):
+        request()
+    cpu = (time.process_time() - start) / iterations
+
+    peaks = []
+    tracemalloc.start()
+    for _ in range(100):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        request()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return cpu, sorted(peaks)[len(peaks) // 2]
+
+
+def test_redirect_lookup_orm_vs_core(test_db):
+    """Compare the ORM lookup with the lean Core redirect read path."""
+    db = test_db()
+    db.add(
+        models.Link(
+            link="PERFX",
+            target="https://example.com/perf-core",
+            extras={"campaign": "perf", "tags": ["a", "b", "c"]},
+        )
+    )
+    db.commit()
+    db.close()
+
+    orm_cpu, orm_peak = _measure_lookup(
+        test_db, lambda db, link: crud.get_link(db, link).target
+    )
+    core_cpu, core_peak = _measure_lookup(test_db, crud.get_link_target)
+
+    print(
+        f"\nORM: {orm_cpu * 1e6:.1f}us/{orm_peak}B, "
+        f"Core: {core_cpu * 1e6:.1f}us/{core_peak}B per redirect lookup"
+    )
+    assert crud.get_link_target(test_db(), "PERFX") == "https://example.com/perf-core"
+
+
+def _load_tracking_links(session_factory, count):
+    """Insert links with long tracking URLs and extras, return their codes."""
+    db = session_factory()
+    links = []
+    for i in range(count):
+        link = f"C{i:04d}"
+        links.append(link)
+        db.add(
+            models.Link(
+                link=link,
+                target=(
+                    f"https://www.example-shop.com/category/item-{i}?"
+                    f"utm_source=newsletter&utm_medium=email"
+                    f"&utm_campaign=spring-sale-{i % 7}&utm_content=cta-{i % 3}"
+                    f"&utm_term=running+shoes&gclid=Cj0KCQjw{i:08d}BhCARIsAGp"
+                ),
+                extras={"campaign": f"spring-sale-{i % 7}", "source": "email"},
+            )
+        )
+    db.commit()
+    db.execute(text("VACUUM"))
+    db.close()
+    return links
+
+
+def test_compressed_storage_size(tmp_path, monkeypatch):
+    """Compare database size and lookup latency with and without compression."""
+    results = {}
+    for enabled in (False, True):
+        monkeypatch.setattr(settings, "compression_enabled", enabled)
+        engine = create_engine(f"sqlite:///{tmp_path}/compressed-{enabled}.db")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        links = _load_tracking_links(session_factory, 2000)
+
+        db = session_factory()
+        pages = db.execute(text("PRAGMA page_count")).scalar()
+        page_size = db.execute(text("PRAGMA page_size")).scalar()
+        start = time.perf_counter()
+        for link in links:
+            assert crud.get_link_target(db, link).startswith("https://")
+        latency = (time.perf_counter() - start) / len(links)
+        db.close()
+        engine.dispose()
+        results[enabled] = (pages * page_size, latency)
+
+    print(
+        f"\nPlain: {results[False][0]}B, {results[False][1] * 1e6:.1f}us/lookup, "
+        f"Compressed: {results[True][0]}B, {results[True][1] * 1e6:.1f}us/lookup"
+    )
+    assert results[True][0] < results[False][0]
+
+
+def test_access_log_overhead(monkeypatch):
+    """Measure the per-request cost of the access log middleware."""
+
+    async def redirect_app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 302,
+                "headers": [(b"location", b"https://example.com/perf")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/PERFX"}
+    logger = AccessLogger("", buffer_size=100000, sample_rate=1.0, flush_interval=1)
+    middleware = AccessLogMiddleware(redirect_app, logger=logger)
+    monkeypatch.setattr(settings, "access_log_enabled", True)
+
+    async def run(app, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await app(scope, None, send)
+        return (time.perf_counter() - start) / iterations
+
+    iterations = 20000
+    bare = asyncio.run(run(redirect_app, iterations))
+    logged = asyncio.run(run(middleware, iterations))
+
+    print(f"\nAccess log overhead: {(logged - bare) * 1e6:.2f}us per redirect")
+    assert logger.stats()["enqueued"] == iterations
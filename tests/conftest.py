@@ -7,6 +7,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from starlette.testclient import TestClient
 
+from app.cache import link_cache
+from app.load_shedding import limiter
 from app.main import app, get_db
 from app.models import Base
 
@@ -45,6 +47,8 @@ def client(test_db):
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    link_cache.clear()
+    limiter.reset()
 
     with TestClient(app) as test_client:
         yield test_client
@@ -0,0 +1,50 @@
+"""Tests for the redirect access log."""
+
+import io
+import json
+
+from starlette.testclient import TestClient
+
+from app.access_log import AccessLogger, access_logger
+from app.config import settings
+
+
+def test_redirects_are_logged(client: TestClient, monkeypatch):
+    """Test that redirects produce structured access log records."""
+    response = client.post("/", json={"target": "https://example.com/logged"})
+    short_link = response.json()["link"]
+
+    monkeypatch.setattr(settings, "access_log_enabled", True)
+    client.get(f"/{short_link}", follow_redirects=False)
+    client.get("/AAAAA", follow_redirects=False)
+    client.get(f"/{short_link}/info")
+    client.get("/metrics")
+
+    output = io.StringIO()
+    assert access_logger.flush(output) == 2
+    first, second = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert first["code"] == short_link
+    assert first["host"] == "example.com"
+    assert first["status"] == 302
+    assert first["latency_ms"] >= 0
+    assert (second["code"], second["host"], second["status"]) == ("AAAAA", None, 404)
+
+
+def test_buffer_drops_and_sampling(tmp_path):
+    """Test that a full buffer drops records and sampling skips them."""
+    log_path = tmp_path / "access.log"
+    logger = AccessLogger(
+        str(log_path), buffer_size=2, sample_rate=1.0, flush_interval=0.01
+    )
+    for _ in range(5):
+        logger.record("AAAAA", 302, b"https://example.com/", 0.001)
+    assert logger.stats()["dropped"] == 3
+
+    logger.start()
+    logger.stop()
+    assert len(log_path.read_text().splitlines()) == 2
+    assert logger.stats() == {"buffered": 0, "enqueued": 2, "dropped": 3, "written": 2}
+
+    logger.sample_rate = 0
+    logger.record("AAAAA", 302, b"https://example.com/", 0.001)
+    assert logger.stats()["buffered"] == 0
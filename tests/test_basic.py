@@ -99,3 +99,37 @@ def test_nonexistent_link(client: TestClient):
     """Test accessing a link that doesn't exist."""
     response = client.get("/AAAAA", follow_redirects=False)
     assert response.status_code == 404
+
+
+def test_resolve_links(client: TestClient, monkeypatch):
+    """Test resolving many links in one call."""
+    from app.config import settings
+
+    # Force several chunks to exercise the chunked IN queries
+    monkeypatch.setattr(settings, "resolve_chunk_size", 2)
+
+    links = []
+    for i in range(3):
+        response = client.post(
+            "/",
+            json={"target": f"https://example.com/{i}", "extras": {"n": i}},
+        )
+        assert response.status_code == 201
+        links.append(response.json()["link"])
+
+    response = client.post(
+        "/resolve",
+        json={"links": links + ["AAAAA", "abc!"], "include_extras": True},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    for i, link in enumerate(links):
+        assert results[link]["status"] == "found"
+        assert results[link]["target"] == f"https://example.com/{i}"
+        assert results[link]["extras"] == {"n": i}
+    assert results["AAAAA"]["status"] == "not_found"
+    assert results["abc!"]["status"] == "invalid_link_format"
+
+    # Extras are only returned when requested
+    response = client.post("/resolve", json={"links": links[:1]})
+    assert response.json()["results"][links[0]]["extras"] is None
@@ -0,0 +1,79 @@
+"""Tests for the link cache and warm-start snapshots."""
+
+import json
+import time
+
+from starlette.testclient import TestClient
+
+from app import models
+from app.cache import LinkCache, link_cache, load_snapshot, save_snapshot
+
+
+def test_cache_eviction_and_hottest():
+    """Test LRU eviction and hot link ordering."""
+    cache = LinkCache(max_size=2)
+    cache.put("AAAAA", "https://a.example.com")
+    cache.put("BBBBB", "https://b.example.com")
+    assert cache.get("AAAAA") == "https://a.example.com"
+    cache.put("CCCCC", "https://c.example.com")
+
+    # BBBBB was the least recently used
+    assert cache.get("BBBBB") is None
+    cache.get("CCCCC")
+    cache.get("CCCCC")
+    assert cache.hottest(2) == ["CCCCC", "AAAAA"]
+
+
+def test_cache_expiry_and_invalidation_race():
+    """Test entry expiry and that invalidated in-flight reads are not cached."""
+    cache = LinkCache(max_size=10, ttl=0.01)
+    cache.put("AAAAA", "https://a.example.com")
+    time.sleep(0.02)
+    assert cache.get("AAAAA") is None
+
+    # A delete invalidates the link while its target is being read
+    generation = cache.generation()
+    cache.invalidate("AAAAA")
+    cache.put("AAAAA", "https://a.example.com", generation)
+    assert cache.get("AAAAA") is None
+
+    cache.put("AAAAA", "https://a.example.com", cache.generation())
+    assert cache.get("AAAAA") == "https://a.example.com"
+
+
+def test_redirect_uses_cache(client: TestClient):
+    """Test that redirects are cached and deletes invalidate the cache."""
+    response = client.post("/", json={"target": "https://example.com/cached"})
+    short_link = response.json()["link"]
+
+    client.get(f"/{short_link}", follow_redirects=False)
+    assert link_cache.get(short_link) == "https://example.com/cached"
+
+    client.delete(f"/{short_link}")
+    assert link_cache.get(short_link) is None
+
+
+def test_snapshot_round_trip(test_db, tmp_path):
+    """Test that snapshots reload the hot set from the database."""
+    db = test_db()
+    db.add(models.Link(link="AAAAA", target="https://a.example.com"))
+    db.add(models.Link(link="BBBBB", target="https://b.example.com"))
+    db.commit()
+
+    cache = LinkCache(max_size=10)
+    for link in ("AAAAA", "BBBBB", "CCCCC"):
+        cache.put(link, f"https://{link}")
+    snapshot_path = str(tmp_path / "snapshot.json")
+    assert save_snapshot(cache, snapshot_path, size=10) == 3
+
+    # CCCCC no longer exists and targets come from the database
+    warm = LinkCache(max_size=10)
+    assert load_snapshot(warm, db, snapshot_path, max_age=60) == 2
+    assert warm.get("AAAAA") == "https://a.example.com"
+    assert warm.get("CCCCC") is None
+
+    # Stale snapshots are ignored
+    with open(snapshot_path, "w") as snapshot_file:
+        json.dump({"created_at": time.time() - 120, "links": ["AAAAA"]}, snapshot_file)
+    assert load_snapshot(LinkCache(max_size=10), db, snapshot_path, max_age=60) == 0
+    db.close()
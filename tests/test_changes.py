@@ -0,0 +1,76 @@
+"""Tests for the link change feed."""
+
+from starlette.testclient import TestClient
+
+from app.config import settings
+from app.maintenance import compact_changelog
+
+
+def test_change_feed(client: TestClient, monkeypatch):
+    """Test that creations and deletions are streamed in order."""
+    links = []
+    for i in range(3):
+        response = client.post("/", json={"target": f"https://example.com/{i}"})
+        links.append(response.json()["link"])
+    client.delete(f"/{links[0]}")
+
+    response = client.get("/changes", params={"since": 0, "limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert [c["link"] for c in data["changes"]] == links[:2]
+    assert data["changes"][0]["operation"] == "create"
+    assert data["changes"][0]["target"] == "https://example.com/0"
+    assert data["next"] == "2"
+
+    data = client.get("/changes", params={"since": data["next"]}).json()
+    assert [(c["link"], c["operation"]) for c in data["changes"]] == [
+        (links[2], "create"),
+        (links[0], "delete"),
+    ]
+    assert data["next"] == "4"
+
+    # Requests without a limit still honor the configured page size
+    monkeypatch.setattr(settings, "changes_page_size", 1)
+    data = client.get("/changes", params={"since": 0}).json()
+    assert len(data["changes"]) == 1
+    monkeypatch.undo()
+
+    # Caught up: a short long poll returns no change and the same cursor
+    data = client.get("/changes", params={"since": "4", "wait": 1}).json()
+    assert data == {"changes": [], "next": "4"}
+
+
+def test_change_feed_compaction(client: TestClient, test_db, monkeypatch):
+    """Test that cursors behind the compacted range are rejected."""
+    for i in range(5):
+        client.post("/", json={"target": f"https://example.com/{i}"})
+
+    engine = test_db().get_bind()
+    assert compact_changelog(engine, retention=3600, max_rows=2) == 3
+
+    response = client.get("/changes", params={"since": 0})
+    assert response.status_code == 410
+    assert response.json()["detail"]["error"] == "cursor_expired"
+    assert response.json()["detail"]["head"] == "5"
+    assert client.get("/changes", params={"since": 1}).status_code == 410
+    data = client.get("/changes", params={"since": 3}).json()
+    assert [c["seq"] for c in data["changes"]] == [4, 5]
+
+    # The latest change is kept even when everything is expired
+    compact_changelog(engine, retention=-1, max_rows=0)
+    assert client.get("/changes", params={"since": 4}).status_code == 200
+    response = client.get("/changes", params={"since": 3})
+    assert response.status_code == 410
+
+    # Resuming from the head cursor only returns later changes
+    head = response.json()["detail"]["head"]
+    client.post("/", json={"target": "https://example.com/after"})
+    data = client.get("/changes", params={"since": head}).json()
+    assert [c["target"] for c in data["changes"]] == ["https://example.com/after"]
+
+
+def test_change_feed_invalid_cursor(client: TestClient, monkeypatch):
+    """Test that malformed cursors are rejected."""
+    assert client.get("/changes", params={"since": "abc"}).status_code == 400
+    monkeypatch.setattr(settings, "shard_count", 3)
+    assert client.get("/changes", params={"since": "1,2"}).status_code == 400
@@ -0,0 +1,129 @@
+"""Tests for transparent compression of targets and extras."""
+
+from sqlalchemy import create_engine, inspect, text
+from starlette.testclient import TestClient
+
+from app.compression import build_dictionary, compress, decompress, dictionary_id
+from app.config import settings
+from app.database import upgrade_schema
+
+LONG_URL = (
+    "https://www.example.com/blog/article/summer-sale?utm_source=newsletter"
+    "&utm_medium=email&utm_campaign=summer-2024&utm_content=header-banner"
+)
+
+
+def test_compress_round_trip(monkeypatch):
+    """Test that compressed values decompress to the original string."""
+    monkeypatch.setattr(settings, "compression_enabled", True)
+    compressed = compress(LONG_URL)
+    assert isinstance(compressed, bytes)
+    assert len(compressed) < len(LONG_URL)
+    assert compress(LONG_URL) == compressed
+    assert decompress(compressed) == LONG_URL
+
+    # Values that do not shrink are stored as is
+    assert compress("https://a.io") == "https://a.io"
+
+    monkeypatch.setattr(settings, "compression_enabled", False)
+    assert compress(LONG_URL) == LONG_URL
+    assert decompress(compressed) == LONG_URL
+
+
+def test_build_dictionary():
+    """Test that frequent URL fragments end up in the dictionary."""
+    samples = [f"https://shop.example.com/p/{i}?utm_source=mail" for i in range(50)]
+    dictionary = build_dictionary(samples, size=256)
+    assert b"?utm_source=" in dictionary
+    assert len(dictionary) <= 256
+
+
+def test_compressed_storage(client: TestClient, test_db, monkeypatch):
+    """Test the API with compression enabled, including legacy plain rows."""
+    db = test_db()
+    db.execute(
+        text("INSERT INTO links (link, target) VALUES ('PLAIN', :target)"),
+        {"target": LONG_URL + "&legacy=1"},
+    )
+    db.commit()
+    # Rows without a target hash get one on startup
+    assert upgrade_schema(test_db.kw["bind"]) == 1
+    monkeypatch.setattr(settings, "compression_enabled", True)
+
+    response = client.post("/", json={"target": LONG_URL, "extras": {"a": [1, 2]}})
+    assert response.status_code == 201
+    short_link = response.json()["link"]
+
+    stored = db.execute(
+        text("SELECT target, extras FROM links WHERE link = :link"),
+        {"link": short_link},
+    ).one()
+    assert isinstance(stored.target, bytes)
+    db.close()
+
+    response = client.get(f"/{short_link}", follow_redirects=False)
+    assert response.headers["location"] == LONG_URL
+    assert client.get(f"/{short_link}/info").json()["extras"] == {"a": [1, 2]}
+
+    # Duplicates are detected on compressed and legacy plain rows alike
+    assert client.post("/", json={"target": LONG_URL}).status_code == 400
+    response = client.post("/", json={"target": LONG_URL + "&legacy=1"})
+    assert response.json()["detail"]["existing_link"] == "PLAIN"
+
+
+def test_duplicates_across_compression_settings(
+    client: TestClient, tmp_path, monkeypatch
+):
+    """Test that duplicates are found after compression settings change."""
+    monkeypatch.setattr(settings, "compression_enabled", True)
+    short_link = client.post("/", json={"target": LONG_URL}).json()["link"]
+
+    dictionary_path = tmp_path / "urls.dict"
+    dictionary_path.write_bytes(build_dictionary([LONG_URL] * 2))
+    monkeypatch.setattr(settings, "compression_dictionary_path", str(dictionary_path))
+    response = client.post("/", json={"target": LONG_URL})
+    assert response.json()["detail"]["existing_link"] == short_link
+
+    monkeypatch.setattr(settings, "compression_enabled", False)
+    response = client.post("/", json={"target": LONG_URL})
+    assert response.json()["detail"]["existing_link"] == short_link
+
+
+def test_upgrade_legacy_schema(tmp_path):
+    """Test that links tables from older versions get the target hash."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE links (id INTEGER PRIMARY KEY, link VARCHAR(20), "
+                "target TEXT NOT NULL, extras TEXT)"
+            )
+        )
+        connection.execute(text("CREATE INDEX ix_links_target ON links (target)"))
+        connection.execute(text("CREATE INDEX ix_target_hash ON links (target)"))
+        connection.execute(
+            text("INSERT INTO links (link, target) VALUES ('PLAIN', :target)"),
+            {"target": LONG_URL},
+        )
+
+    assert upgrade_schema(engine) == 1
+    assert upgrade_schema(engine) == 0
+    indexes = {index["name"] for index in inspect(engine).get_indexes("links")}
+    assert indexes == {"ix_links_target_hash"}
+    engine.dispose()
+
+
+def test_dictionary_rotation(client: TestClient, tmp_path, monkeypatch):
+    """Test that links compressed with a previous dictionary stay readable."""
+    monkeypatch.setattr(settings, "compression_enabled", True)
+    old_path = tmp_path / "urls-v1.dict"
+    old_path.write_bytes(build_dictionary([LONG_URL] * 2))
+    monkeypatch.setattr(settings, "compression_dictionary_path", str(old_path))
+    short_link = client.post("/", json={"target": LONG_URL}).json()["link"]
+
+    new_path = tmp_path / "urls-v2.dict"
+    new_path.write_bytes(build_dictionary([LONG_URL.replace("blog", "shop")] * 2))
+    monkeypatch.setattr(settings, "compression_dictionary_path", str(new_path))
+    assert compress(LONG_URL)[1:5] != dictionary_id(old_path.read_bytes())
+    response = client.get(f"/{short_link}", follow_redirects=False)
+    assert response.headers["location"] == LONG_URL
@@ -0,0 +1,73 @@
+"""Tests for adaptive load shedding."""
+
+from starlette.testclient import TestClient
+
+from app.config import settings
+from app.load_shedding import AdaptiveLimiter, limiter
+
+
+def test_limiter_adapts_to_read_latency():
+    """Test that the write limit shrinks when reads are slow and recovers."""
+    now = [0.0]
+    test_limiter = AdaptiveLimiter(
+        min_limit=1,
+        max_limit=8,
+        read_latency_target=0.05,
+        max_queue_depth=100,
+        window=1.0,
+        clock=lambda: now[0],
+    )
+
+    def slow_read():
+        test_limiter.start_read()
+        test_limiter.finish_read(5.0)
+
+    def write():
+        assert test_limiter.try_start_write()
+        test_limiter.finish_write(0.01)
+
+    # Many writes completing in one window only decrease the limit once
+    slow_read()
+    for _ in range(5):
+        write()
+    assert test_limiter.limit == 8 * 0.9
+
+    for _ in range(50):
+        now[0] += 1
+        slow_read()
+        write()
+    assert test_limiter.limit == 1
+
+    # Only one write at a time is admitted now
+    assert test_limiter.try_start_write()
+    assert not test_limiter.try_start_write()
+    test_limiter.finish_write(0.01)
+
+    # Without reads for a window, the stale read latency no longer counts
+    now[0] += 2
+    for _ in range(100):
+        write()
+    assert test_limiter.read_latency == 0
+    assert test_limiter.limit > 1
+
+
+def test_writes_shed_before_reads(client: TestClient):
+    """Test that writes get a 503 on overload while redirects keep working."""
+    response = client.post("/", json={"target": "https://example.com/shed"})
+    short_link = response.json()["link"]
+
+    limiter.max_queue_depth = 0
+    try:
+        response = client.post("/", json={"target": "https://example.com/other"})
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert response.json()["detail"]["error"] == "overloaded"
+        assert client.delete(f"/{short_link}").status_code == 503
+
+        response = client.get(f"/{short_link}", follow_redirects=False)
+        assert response.status_code == 302
+    finally:
+        limiter.max_queue_depth = settings.max_queue_depth
+
+    metrics = client.get("/metrics").json()
+    assert metrics["load_shedding"]["writes_shed"] == 2
@@ -0,0 +1,78 @@
+"""Tests for the database maintenance jobs."""
+
+import asyncio
+import logging
+
+from sqlalchemy import delete
+
+from app import models
+from app.config import settings
+from app.database import Base, create_sqlite_engine
+from app.maintenance import (
+    MaintenanceScheduler,
+    checkpoint,
+    database_stats,
+    incremental_vacuum,
+)
+
+
+def test_maintenance_jobs(tmp_path, monkeypatch):
+    """Test that a maintenance run checkpoints and shrinks the database."""
+    engine = create_sqlite_engine(str(tmp_path / "shortgic.db"))
+    Base.metadata.create_all(bind=engine)
+    links = models.Link.__table__
+    with engine.begin() as connection:
+        connection.execute(
+            links.insert(),
+            [
+                {"link": f"L{i:04d}", "target": f"https://example.com/{'x' * 200}/{i}"}
+                for i in range(2000)
+            ],
+        )
+    with engine.begin() as connection:
+        connection.execute(delete(links).where(links.c.id > 100))
+    checkpoint(engine)
+    before = database_stats(engine)
+    assert before["freelist_count"] > 16
+
+    # One call frees the requested number of pages
+    assert incremental_vacuum(engine, 16) == before["freelist_count"] - 16
+
+    monkeypatch.setattr(settings, "maintenance_vacuum_pages", 16)
+    monkeypatch.setattr(settings, "maintenance_vacuum_pause_ms", 0)
+    scheduler = MaintenanceScheduler([engine])
+    asyncio.run(scheduler.run_pending(0))
+    assert asyncio.run(scheduler.run_pending(86400))
+
+    stats = scheduler.stats["0"]
+    assert stats["checkpoint"]["busy"] == 0
+    assert stats["freelist_count"] == 0
+    assert stats["page_count"] < before["page_count"] - 16
+    engine.dispose()
+
+
+def test_maintenance_survives_errors(tmp_path, caplog):
+    """Test that an unexpected job error is logged and maintenance goes on."""
+    engine = create_sqlite_engine(str(tmp_path / "shortgic.db"))
+    scheduler = MaintenanceScheduler([engine])
+    runs = []
+
+    async def failing_run_pending(now):
+        runs.append(now)
+        raise RuntimeError("database disk image is malformed")
+
+    scheduler.run_pending = failing_run_pending
+
+    async def run_briefly():
+        task = asyncio.create_task(scheduler.run(tick=0))
+        while len(runs) < 3:
+            await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return task
+
+    with caplog.at_level(logging.ERROR, logger="app.maintenance"):
+        task = asyncio.run(run_briefly())
+    assert task.cancelled()
+    assert "Database maintenance run failed" in caplog.text
+    engine.dispose()
@@ -0,0 +1,142 @@
+"""Tests for the dead target scanner."""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import select
+from starlette.testclient import TestClient
+
+from app import models
+from app.scanner import DeadTargetScanner
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Local stand-in for link targets, one behavior per path."""
+
+    def do_HEAD(self):
+        if self.path == "/no-head":
+            self.send_response(405)
+            self.end_headers()
+            return
+        self.do_GET()
+
+    def do_GET(self):
+        if self.path in ("/ok", "/no-head"):
+            self.send_response(200)
+        elif self.path == "/moved":
+            self.send_response(301)
+            self.send_header("Location", "/ok")
+        elif self.path == "/loop":
+            self.send_response(302)
+            self.send_header("Location", "/loop")
+        elif self.path == "/broken":
+            self.send_response(500)
+        else:
+            self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    """Serve the stand-in targets on a local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_scan_targets(test_db, stand_in_server):
+    """Test that every kind of target is classified and recorded."""
+    expected = {
+        "OKAYS": ("/ok", "ok", 200),
+        "MOVED": ("/moved", "ok", 200),
+        "NOHED": ("/no-head", "ok", 200),
+        "GONES": ("/gone", "dead", 404),
+        "LOOPS": ("/loop", "redirect_loop", None),
+        "BROKE": ("/broken", "http_error", 500),
+    }
+    db = test_db()
+    for link, (path, _, _) in expected.items():
+        db.add(models.Link(link=link, target=stand_in_server + path))
+    # Nothing listens on port 9 of the loopback interface
+    db.add(models.Link(link="DOWNS", target="http://127.0.0.1:9/"))
+    db.commit()
+
+    scanner = DeadTargetScanner(
+        concurrency=4,
+        per_host_concurrency=2,
+        per_host_interval=0.001,
+        timeout=5,
+        max_redirects=3,
+    )
+    totals = asyncio.run(scanner.scan([db.get_bind()], chunk_size=3))
+    assert totals == {
+        "ok": 3,
+        "dead": 1,
+        "redirect_loop": 1,
+        "http_error": 1,
+        "unreachable": 1,
+    }
+
+    checks = {
+        check.link: check for check in db.execute(select(models.LinkCheck)).scalars()
+    }
+    for link, (_, status, http_status) in expected.items():
+        assert (checks[link].status, checks[link].http_status) == (status, http_status)
+    assert checks["DOWNS"].status == "unreachable"
+    db.close()
+
+
+def test_scan_busy_host_and_request_errors(test_db, stand_in_server):
+    """Test that a busy host does not hold up others and errors are recorded."""
+    db = test_db()
+    for i in range(5):
+        db.add(models.Link(link=f"BUSY{i}", target=f"{stand_in_server}/ok"))
+    # Same server under another host name
+    other = stand_in_server.replace("127.0.0.1", "localhost")
+    db.add(models.Link(link="OTHER", target=f"{other}/ok"))
+    # Rejected by the IDNA codec before any request is sent
+    db.add(models.Link(link="BADNM", target="http://xn--zz.com/"))
+    db.commit()
+
+    scanner = DeadTargetScanner(
+        concurrency=2,
+        per_host_concurrency=1,
+        per_host_interval=0.2,
+        timeout=5,
+        max_redirects=3,
+    )
+    totals = asyncio.run(
+        asyncio.wait_for(scanner.scan([db.get_bind()], chunk_size=10), timeout=10)
+    )
+    assert totals == {"ok": 6, "unreachable": 1}
+
+    checks = {
+        check.link: check for check in db.execute(select(models.LinkCheck)).scalars()
+    }
+    assert checks["OTHER"].checked_at < checks["BUSY1"].checked_at
+    assert checks["BADNM"].status == "unreachable"
+    assert checks["BADNM"].error
+    db.close()
+
+
+def test_delete_removes_check(client: TestClient, test_db):
+    """Test that deleting a link also deletes its scanner result."""
+    short_link = client.post("/", json={"target": "https://example.com/x"}).json()[
+        "link"
+    ]
+    db = test_db()
+    db.add(models.LinkCheck(link=short_link, status="dead", checked_at=0))
+    db.commit()
+
+    assert client.delete(f"/{short_link}").status_code == 204
+    assert db.get(models.LinkCheck, short_link) is None
+    db.close()
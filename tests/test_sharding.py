@@ -0,0 +1,130 @@
+"""Tests for sharded link storage."""
+
+import pytest
+from starlette.testclient import TestClient
+
+from app import crud, models
+from app.config import settings
+from app.database import (
+    Base,
+    create_sqlite_engine,
+    make_session_factory,
+    shard_database_path,
+    shard_for,
+)
+from app.main import app, get_db
+from app.reshard import reshard
+
+
+def _shard_engines(database_path, shard_count):
+    engines = [
+        create_sqlite_engine(shard_database_path(database_path, i, shard_count))
+        for i in range(shard_count)
+    ]
+    for engine in engines:
+        Base.metadata.create_all(bind=engine)
+    return engines
+
+
+def _links_per_shard(engines, table=models.Link.__table__):
+    with_links = []
+    for engine in engines:
+        with engine.connect() as connection:
+            rows = connection.execute(table.select()).all()
+        with_links.append({row.link for row in rows})
+    return with_links
+
+
+@pytest.fixture
+def sharded_client(tmp_path, monkeypatch):
+    """Create a test client backed by three shard files."""
+    monkeypatch.setattr(settings, "shard_count", 3)
+    database_path = str(tmp_path / "shortgic.db")
+    engines = _shard_engines(database_path, 3)
+    session_factory = make_session_factory(engines)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as test_client:
+        yield test_client, engines, database_path
+    app.dependency_overrides.clear()
+
+
+def test_sharded_crud(sharded_client):
+    """Test that links are stored in and resolved from their own shard."""
+    client, engines, _ = sharded_client
+
+    links = []
+    for i in range(12):
+        response = client.post("/", json={"target": f"https://example.com/{i}"})
+        assert response.status_code == 201
+        links.append(response.json()["link"])
+
+    per_shard = _links_per_shard(engines)
+    for link in links:
+        assert link in per_shard[shard_for(link, 3)]
+
+    for i, link in enumerate(links):
+        response = client.get(f"/{link}", follow_redirects=False)
+        assert response.headers["location"] == f"https://example.com/{i}"
+
+    response = client.post("/resolve", json={"links": links})
+    assert all(r["status"] == "found" for r in response.json()["results"].values())
+
+    # Duplicate detection works across shards
+    for i in range(12):
+        response = client.post("/", json={"target": f"https://example.com/{i}"})
+        assert response.status_code == 400
+
+    assert client.delete(f"/{links[0]}").status_code == 204
+    assert client.get(f"/{links[0]}").status_code == 404
+
+    # Each shard records the changes of its own links
+    data = client.get("/changes", params={"since": 0, "limit": 1000}).json()
+    assert len(data["changes"]) == 13
+    assert data["changes"][-1]["operation"] == "delete"
+    assert len(data["next"].split(",")) == 3
+    assert (
+        client.get("/changes", params={"since": data["next"]}).json()["changes"] == []
+    )
+
+
+def test_reshard(tmp_path):
+    """Test that resharding moves every link to its new shard."""
+    database_path = str(tmp_path / "shortgic.db")
+    session_factory = make_session_factory(_shard_engines(database_path, 1))
+    db = session_factory()
+    targets = {}
+    for i in range(40):
+        link = f"L{i:04d}"
+        targets[link] = f"https://example.com/{i}"
+        db.add(models.Link(link=link, target=targets[link], extras={"n": i}))
+        db.add(models.LinkCheck(link=link, status="ok", checked_at=0))
+    db.commit()
+    db.close()
+
+    for old_count, new_count in ((1, 4), (4, 3), (3, 1)):
+        reshard(database_path, old_count, new_count, batch_size=7)
+        engines = _shard_engines(database_path, new_count)
+        per_shard = _links_per_shard(engines)
+        assert sum(len(links) for links in per_shard) == len(targets)
+        for link in targets:
+            assert link in per_shard[shard_for(link, new_count)]
+        # Scanner results follow their links
+        assert _links_per_shard(engines, models.LinkCheck.__table__) == per_shard
+
+        settings_count = settings.shard_count
+        settings.shard_count = new_count
+        try:
+            db = make_session_factory(engines)()
+            for link, target in targets.items():
+                assert crud.get_link_target(db, link) == target
+            db.close()
+        finally:
+            settings.shard_count = settings_count